@@ -1,35 +1,75 @@
 import os
+import copy
+import gzip
+import hashlib
+import importlib
 import traceback
 import json
 import logging
-from flask import Flask, request, render_template, jsonify, session, abort, send_from_directory
+import logging.handlers
+import queue
+from flask import Flask, request, jsonify
+from werkzeug.exceptions import NotFound
 from flask_socketio import SocketIO, emit
 from werkzeug.middleware.proxy_fix import ProxyFix
-import signal
-from functools import wraps
-#import threading
-#import multiprocessing
+from functools import lru_cache
 import concurrent.futures
-from datetime import datetime
+import atexit
+import threading
+from datetime import date, datetime
+from pathlib import Path
 import psutil
-import re
+import time
 from flask_cors import CORS
+from flask.json.provider import DefaultJSONProvider
 
-# Import simulation functions from plugins
-from plugins.authentication.auth import generate_quantum_fingerprint_cirq
-from plugins.encryption_bb84.bb84 import bb84_protocol_cirq
-from plugins.error_correction.shor_code import run_shor_code
-from plugins.grover.grover import run_grover
-from plugins.handshake.handshake import handshake_cirq
-from plugins.network.network import entanglement_swapping_cirq
-from plugins.qrng.qrng import generate_random_number_cirq
-from plugins.quantum_decryption.quantum_decryption import grover_key_search, shor_factorization
-from plugins.teleportation.teleport import teleportation_circuit
-from plugins.variational.vqe import run_vqe
-from plugins.deutsch_jozsa.deutsch_jozsa import deutsch_jozsa_cirq
-from plugins.quantum_fourier.qft import run_qft
-from plugins.phase_estimation.phase_estimation import run_phase_estimation
-from plugins.optimization.qaoa import run_qaoa
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; responses are then only gzip-compressed
+    brotli = None
+
+class LazyPluginRef:
+    """
+    Reference to a plugin simulation function that is imported on first use,
+    so the heavy Cirq/NumPy/SciPy plugin modules do not load at startup.
+    """
+    __slots__ = ('module_path', 'func_name', '_func')
+    
+    def __init__(self, module_path, func_name):
+        self.module_path = module_path
+        self.func_name = func_name
+        self._func = None
+    
+    def resolve(self):
+        """Import the plugin module if needed and return the simulation function."""
+        if self._func is None:
+            self._func = getattr(importlib.import_module(self.module_path), self.func_name)
+        return self._func
+    
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+# Simulation functions from plugins
+generate_quantum_fingerprint_cirq = LazyPluginRef('plugins.authentication.auth', 'generate_quantum_fingerprint_cirq')
+bb84_protocol_cirq = LazyPluginRef('plugins.encryption_bb84.bb84', 'bb84_protocol_cirq')
+run_shor_code = LazyPluginRef('plugins.error_correction.shor_code', 'run_shor_code')
+run_grover = LazyPluginRef('plugins.grover.grover', 'run_grover')
+handshake_cirq = LazyPluginRef('plugins.handshake.handshake', 'handshake_cirq')
+entanglement_swapping_cirq = LazyPluginRef('plugins.network.network', 'entanglement_swapping_cirq')
+generate_random_number_cirq = LazyPluginRef('plugins.qrng.qrng', 'generate_random_number_cirq')
+grover_key_search = LazyPluginRef('plugins.quantum_decryption.quantum_decryption', 'grover_key_search')
+shor_factorization = LazyPluginRef('plugins.quantum_decryption.quantum_decryption', 'shor_factorization')
+teleportation_circuit = LazyPluginRef('plugins.teleportation.teleport', 'teleportation_circuit')
+run_vqe = LazyPluginRef('plugins.variational.vqe', 'run_vqe')
+deutsch_jozsa_cirq = LazyPluginRef('plugins.deutsch_jozsa.deutsch_jozsa', 'deutsch_jozsa_cirq')
+run_qft = LazyPluginRef('plugins.quantum_fourier.qft', 'run_qft')
+run_phase_estimation = LazyPluginRef('plugins.phase_estimation.phase_estimation', 'run_phase_estimation')
+run_qaoa = LazyPluginRef('plugins.optimization.qaoa', 'run_qaoa')
 
 # Configure Errors
 class SimulationError(Exception):
@@ -59,19 +99,28 @@ def configure_logging():
     if not os.path.exists('logs'):
         os.makedirs('logs')
         
-    # Create log file with date-based naming
-    log_filename = f"logs/quantum_field_kit_{datetime.now().strftime('%Y-%m-%d')}.log"
+    formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s - %(message)s")
+    handlers = [
+        # Console handler for immediate feedback
+        logging.StreamHandler(),
+        # File handler for persistent logs, rolled over at midnight (UTC) and kept for two weeks
+        logging.handlers.TimedRotatingFileHandler(
+            'logs/quantum_field_kit.log', when='midnight', backupCount=14, utc=True
+        )
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    # Request threads only enqueue records; a background listener does the I/O
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
     
     # Configure root logger
     logging.basicConfig(
         level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
-        handlers=[
-            # Console handler for immediate feedback
-            logging.StreamHandler(),
-            # File handler for persistent logs
-            logging.FileHandler(log_filename)
-        ]
+        handlers=[logging.handlers.QueueHandler(log_queue)]
     )
     
     # Set specific logger levels
@@ -83,8 +132,33 @@ def configure_logging():
 # Create application logger
 logger = configure_logging()
 
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that encodes responses with orjson, including numpy arrays."""
+    
+    def _option(self):
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self._option()).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # jsonify() goes through here; hand orjson's bytes straight to the
+        # response instead of decoding to str and re-encoding
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default,
+                            option=self._option() | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
 # Initialize Flask application (serve React build in production)
 app = Flask(__name__, static_folder='frontend/build', static_url_path='/')
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 
 # Configure CORS origins from environment variable
 cors_origins = os.environ.get('CORS_ORIGINS', 
@@ -98,7 +172,13 @@ CORS(app, resources={
         "allow_headers": ["Content-Type"]
     }
 })
-app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', os.urandom(24))
+# Only fall back to a random per-process key when none is configured
+app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY')
+if not app.config['SECRET_KEY']:
+    app.config['SECRET_KEY'] = os.urandom(24)
+    if os.environ.get('FLASK_ENV') == 'production':
+        logger.warning("SECRET_KEY is not set; using a random per-process key, so sessions "
+                       "will not survive restarts or be shared between workers")
 app.config['TEMPLATES_AUTO_RELOAD'] = True
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max upload
 
@@ -108,72 +188,135 @@ app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1)
 # Initialize Socket.IO for real-time communication
 socketio = SocketIO(app, async_mode='eventlet', cors_allowed_origins="*")
 
-def timeout(seconds):
+# Shared worker pool for simulations, reused across requests. Sized from the
+# environment, since the host's CPU count says little about a shared VM.
+_SIM_WORKERS = max(1, int(os.environ.get('SIM_WORKERS', 4)))
+_SIM_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=_SIM_WORKERS,
+    thread_name_prefix="sim"
+)
+atexit.register(_SIM_EXECUTOR.shutdown, wait=False)
+
+# Free worker slots. A simulation that timed out keeps running in its thread,
+# so its slot is only released once it actually finishes.
+_SIM_SLOTS = threading.BoundedSemaphore(_SIM_WORKERS)
+
+def run_with_timeout(seconds, plugin_name, func, /, *args, **kwargs):
     """
-    Decorator that adds a timeout to a function.
-    If the function takes longer than 'seconds' to execute, it will be terminated.
+    Run func on the shared simulation pool, giving up after 'seconds'.
+    
+    Waiting for a free worker counts against the same time budget.
     
     Args:
         seconds: Maximum execution time in seconds
+        plugin_name: Name used in the timeout message
+        func: Function to call with the remaining arguments
         
     Returns:
-        Decorated function with timeout capability
+        The function's result, or an error result dictionary on timeout
+        
+    Raises:
+        ResourceExceededError: If no worker frees up within 'seconds'
     """
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            plugin_name = kwargs.get('_plugin_name', 'Unknown plugin')
-            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-                future = executor.submit(func, *args, **kwargs)
-                try:
-                    return future.result(timeout=seconds)
-                except concurrent.futures.TimeoutError:
-                    # More detailed timeout message
-                    return {
-                        "output": None, 
-                        "log": f"Simulation for {plugin_name} started but could not complete within {seconds} seconds.\n"
-                               f"This may be due to complex parameters or high precision settings.",
-                        "error": f"Execution timed out after {seconds} seconds. Try reducing complexity of the simulation."
-                    }
-        return wrapper
-    return decorator
+    deadline = time.monotonic() + seconds
+    if not _SIM_SLOTS.acquire(timeout=seconds):
+        raise ResourceExceededError(
+            "All simulation workers are busy",
+            suggestion="Please try again in a few moments."
+        )
+    try:
+        future = _SIM_EXECUTOR.submit(func, *args, **kwargs)
+    except Exception:
+        _SIM_SLOTS.release()
+        raise
+    future.add_done_callback(lambda _: _SIM_SLOTS.release())
+    
+    try:
+        return future.result(timeout=max(0, deadline - time.monotonic()))
+    except concurrent.futures.TimeoutError:
+        if not future.cancel():
+            logger.warning(f"Simulation for {plugin_name} exceeded {seconds}s and is still running in the background")
+        # More detailed timeout message
+        return {
+            "output": None, 
+            "log": f"Simulation for {plugin_name} started but could not complete within {seconds} seconds.\n"
+                   f"This may be due to complex parameters or high precision settings.",
+            "error": f"Execution timed out after {seconds} seconds. Try reducing complexity of the simulation."
+        }
+
+# Types that serialize to JSON as-is
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+# Result key a plugin can set to declare that its result is already JSON-serializable
+JSON_SAFE_MARKER = "__json_safe__"
 
 def json_safe(obj):
     """
-    Recursively convert non-JSON-serializable objects to strings.
+    Convert non-JSON-serializable objects to strings.
     Preserve raw SVG (under the key "circuit_svg") so it is not altered.
+    
+    Containers are walked with an explicit stack rather than recursion, so
+    deeply nested results cannot hit the interpreter's recursion limit.
+    Dictionaries carrying JSON_SAFE_MARKER are returned without the marker
+    and without being walked.
     """
-    try:
-        json.dumps(obj)
+    if isinstance(obj, _JSON_SCALARS):
         return obj
-    except (TypeError, OverflowError):
-        if isinstance(obj, dict):
+    if isinstance(obj, dict) and obj.get(JSON_SAFE_MARKER, False):
+        # Copy rather than pop, so a cached or reused result keeps its marker
+        return {k: v for k, v in obj.items() if k != JSON_SAFE_MARKER}
+    
+    root = [None]
+    stack = [(root, 0, obj)]
+    while stack:
+        parent, key, value = stack.pop()
+        if isinstance(value, _JSON_SCALARS):
+            parent[key] = value
+        elif isinstance(value, dict):
             new_obj = {}
-            for k, v in obj.items():
-                new_obj[k] = v if k == "circuit_svg" else json_safe(v)
-            return new_obj
-        elif isinstance(obj, (list, tuple)):
-            return [json_safe(item) for item in obj]
-        elif hasattr(obj, 'tolist'):  # For numpy arrays
-            return obj.tolist()
+            parent[key] = new_obj
+            for k, v in value.items():
+                # Insert keys up front so the original ordering is kept
+                new_obj[k] = v
+                if k != "circuit_svg":
+                    stack.append((new_obj, k, v))
+        elif isinstance(value, (list, tuple)):
+            new_list = list(value)
+            parent[key] = new_list
+            stack.extend((new_list, i, item) for i, item in enumerate(new_list))
+        elif hasattr(value, 'tolist'):  # For numpy arrays
+            parent[key] = value.tolist()
         else:
-            return str(obj)
+            parent[key] = str(value)
+    return root[0]
+
+# Process handle and most recent memory check as (monotonic timestamp, result)
+_PROCESS = psutil.Process(os.getpid())
+_MEMORY_CHECK_INTERVAL = 0.5  # seconds
+_last_memory_check = (float('-inf'), True)
 
 def check_memory_usage():
     """Check if memory usage is within acceptable limits"""
+    global _last_memory_check
+    
+    checked_at, within_limits = _last_memory_check
+    now = time.monotonic()
+    if now - checked_at < _MEMORY_CHECK_INTERVAL:
+        return within_limits
+    
     try:
-        process = psutil.Process(os.getpid())
-        memory_usage = process.memory_info().rss / (1024 * 1024) # MB
-        memory_percent = process.memory_percent()
+        memory_percent = _PROCESS.memory_percent()
+        within_limits = memory_percent <= 85
         
-        if memory_percent > 85:
+        if not within_limits:
+            memory_usage = _PROCESS.memory_info().rss / (1024 * 1024) # MB
             logger.warning(f"High memory usage detected: {memory_usage:.2f} MB ({memory_percent:.1f}%)")
-            return False
-        
-        return True
     except Exception as e:
         logger.error(f"Error checking memory usage: {e}")
-        return True  # Assume it's safe if we can't check
+        within_limits = True  # Assume it's safe if we can't check
+    
+    _last_memory_check = (now, within_limits)
+    return within_limits
 
 def wrap_result(sim_result):
     """
@@ -200,11 +343,24 @@ def wrap_result(sim_result):
     else:
         return {"output": json_safe(sim_result), "log": "", "error": None}
 
-def run_plugin(sim_func, **params):
+@lru_cache(maxsize=512)
+def _run_cached(sim_func, param_items):
+    """Run a deterministic simulation once per parameter set and reuse its wrapped result."""
+    return wrap_result(sim_func(**dict(param_items)))
+
+def run_plugin(sim_func, *, _plugin_key='unknown_plugin', _plugin_name=None, _cacheable=False, **params):
     """
     Calls the simulation function with the given parameters.
     Returns a standardized result dictionary with improved error handling.
+    
+    The keyword-only arguments are used for reporting and caching and are never
+    passed to the simulation function. _plugin_name is accepted for backward
+    compatibility and ignored. Pass _cacheable=True only when the parameters
+    fully determine the result (no noise or random sampling), so that repeated
+    runs can be memoized.
     """
+    plugin_key = _plugin_key
+    
     # Check memory before running simulation
     if not check_memory_usage():
         return {
@@ -214,25 +370,25 @@ def run_plugin(sim_func, **params):
         }
     
     try:
-        # Extract plugin key for error reporting but don't pass it to the simulation function
-        plugin_key = params.pop('_plugin_key', 'unknown_plugin')
-        
-        # Also remove _plugin_name if it exists (backward compatibility)
-        params.pop('_plugin_name', None)
+        cache_key = tuple(sorted(params.items())) if _cacheable else None
         
         logger.info(f"Running {plugin_key} simulation with parameters: {params}")
         
-        # Apply timeout to simulation function
-        @timeout(15)  # Increased timeout for complex simulations
-        def run_with_timeout():
-            # Don't pass plugin identifiers to the actual simulation function
-            return sim_func(**params)
+        # Apply timeout to simulation function (increased for complex simulations)
+        if cache_key is not None:
+            sim_result = run_with_timeout(15, plugin_key, _run_cached, sim_func, cache_key)
+        else:
+            sim_result = run_with_timeout(15, plugin_key, sim_func, **params)
         
-        sim_result = run_with_timeout()
         if isinstance(sim_result, dict) and "error" in sim_result and sim_result["error"] is not None:
             # This is a timeout error from our decorator
             return sim_result
         
+        if cache_key is not None:
+            # Memoized results are already wrapped; copy them so callers
+            # cannot alter the result stored in the cache
+            return copy.deepcopy(sim_result)
+        
         return wrap_result(sim_result)
     except ParameterError as e:
         # Handle parameter errors with helpful suggestions
@@ -252,6 +408,14 @@ def run_plugin(sim_func, **params):
         
         logger.error(f"Circuit error in {plugin_key}: {error_msg}")
         return {"output": None, "log": None, "error": error_msg}
+    except ResourceExceededError as e:
+        # Handle server capacity errors
+        error_msg = e.message
+        if e.suggestion:
+            error_msg += f"\nSuggestion: {e.suggestion}"
+        
+        logger.warning(f"Resources exceeded for {plugin_key}: {e.message}")
+        return {"output": None, "log": None, "error": error_msg}
     except Exception as e:
         # Generic exception handling with improved context
         error_type = type(e).__name__
@@ -270,124 +434,143 @@ def run_plugin(sim_func, **params):
             "error": user_error
         }
     
-def validate_parameters(plugin, params):
-    """Enhanced parameter validation with detailed error messages"""
-    validated_params = {}
+_NO_DEFAULT = object()
+
+def _compile_number_validator(param, cast, type_label, suggestion):
+    """Build a validator for an int/float parameter with optional min/max bounds."""
+    param_name = param["name"]
+    min_val = param.get("min")
+    max_val = param.get("max")
     
-    for param in plugin["parameters"]:
-        param_name = param["name"]
-        
-        # Check if required parameter is missing
-        if param_name not in params and "default" not in param:
-            raise ParameterError(
-                f"Missing required parameter: {param_name}",
-                param_info=f"{param_name} ({param['type']})",
-                suggestion="Please provide a value for this required parameter."
-            )
+    # Error text that only depends on the schema is built once per parameter
+    invalid_msg = f"Invalid {type_label} value for {param_name}"
+    too_small_msg = f"Value for {param_name} is too small"
+    too_large_msg = f"Value for {param_name} is too large"
+    min_suggestion = f"Minimum allowed value is {min_val}."
+    max_suggestion = f"Maximum allowed value is {max_val}."
+    
+    def validate(raw_val):
+        try:
+            val = cast(raw_val)
+        except ValueError:
+            raise ParameterError(invalid_msg, param_info=f"Received: {raw_val}", suggestion=suggestion)
+        # Check min/max bounds
+        if min_val is not None and val < min_val:
+            raise ParameterError(too_small_msg, param_info=f"{param_name} = {val}", suggestion=min_suggestion)
+        if max_val is not None and val > max_val:
+            raise ParameterError(too_large_msg, param_info=f"{param_name} = {val}", suggestion=max_suggestion)
+        return val
+    return validate
+
+# Accepted spellings of string booleans, matched after strip() and lower()
+_TRUE_STRINGS = frozenset({"true", "1", "yes", "on"})
+_FALSE_STRINGS = frozenset({"false", "0", "no", "off"})
+
+def _compile_bool_validator(param):
+    invalid_msg = f"Invalid boolean value for {param['name']}"
+    
+    def validate(raw_val):
+        if raw_val is True or raw_val is False:
+            return raw_val
+        if isinstance(raw_val, str):
+            normalized = raw_val.strip().lower()
+            if normalized in _TRUE_STRINGS:
+                return True
+            if normalized in _FALSE_STRINGS:
+                return False
+        raise ParameterError(invalid_msg, param_info=f"Received: {raw_val}",
+                             suggestion="Please provide 'true' or 'false'.")
+    return validate
+
+def _compile_str_validator(param):
+    param_name = param["name"]
+    max_length = param.get("max_length")
+    options = frozenset(param["options"]) if "options" in param else None
+    
+    too_long_msg = f"Value for {param_name} is too long"
+    too_long_suggestion = f"Maximum allowed length is {max_length} characters."
+    invalid_option_msg = f"Invalid option for {param_name}"
+    options_suggestion = f"Allowed options are: {', '.join(param.get('options', ()))}"
+    
+    def validate(raw_val):
+        if not isinstance(raw_val, str):
+            raw_val = str(raw_val)
         
-        # Use default if parameter is missing
-        if param_name not in params and "default" in param:
-            validated_params[param_name] = param["default"]
-            continue
-            
-        # Validate parameter based on type
-        raw_val = params[param_name]
+        # Check max length for strings
+        if max_length is not None and len(raw_val) > max_length:
+            raise ParameterError(too_long_msg, param_info=f"Length: {len(raw_val)} characters",
+                                 suggestion=too_long_suggestion)
         
-        if param["type"] == "int":
-            try:
-                val = int(raw_val)
-                # Check min/max bounds
-                if "min" in param and val < param["min"]:
-                    raise ParameterError(
-                        f"Value for {param_name} is too small",
-                        param_info=f"{param_name} = {val}",
-                        suggestion=f"Minimum allowed value is {param['min']}."
-                    )
-                if "max" in param and val > param["max"]:
-                    raise ParameterError(
-                        f"Value for {param_name} is too large",
-                        param_info=f"{param_name} = {val}",
-                        suggestion=f"Maximum allowed value is {param['max']}."
-                    )
-                validated_params[param_name] = val
-            except ValueError:
-                raise ParameterError(
-                    f"Invalid integer value for {param_name}",
-                    param_info=f"Received: {raw_val}",
-                    suggestion="Please provide a valid integer value."
-                )
-                
-        elif param["type"] == "float":
-            try:
-                val = float(raw_val)
-                # Check min/max bounds
-                if "min" in param and val < param["min"]:
-                    raise ParameterError(
-                        f"Value for {param_name} is too small",
-                        param_info=f"{param_name} = {val}",
-                        suggestion=f"Minimum allowed value is {param['min']}."
-                    )
-                if "max" in param and val > param["max"]:
-                    raise ParameterError(
-                        f"Value for {param_name} is too large",
-                        param_info=f"{param_name} = {val}",
-                        suggestion=f"Maximum allowed value is {param['max']}."
-                    )
-                validated_params[param_name] = val
-            except ValueError:
-                raise ParameterError(
-                    f"Invalid float value for {param_name}",
-                    param_info=f"Received: {raw_val}",
-                    suggestion="Please provide a valid decimal number."
-                )
-                
-        elif param["type"] == "bool":
-            if isinstance(raw_val, bool):
-                validated_params[param_name] = raw_val
-            elif isinstance(raw_val, str):
-                validated_params[param_name] = raw_val.lower() == "true"
-            else:
-                raise ParameterError(
-                    f"Invalid boolean value for {param_name}",
-                    param_info=f"Received: {raw_val}",
-                    suggestion="Please provide 'true' or 'false'."
-                )
-                
-        elif param["type"] == "str":
-            if not isinstance(raw_val, str):
-                raw_val = str(raw_val)
-                
-            # Check max length for strings
-            if "max_length" in param and len(raw_val) > param["max_length"]:
-                raise ParameterError(
-                    f"Value for {param_name} is too long",
-                    param_info=f"Length: {len(raw_val)} characters",
-                    suggestion=f"Maximum allowed length is {param['max_length']} characters."
-                )
-                
-            # Check if value is in allowed options
-            if "options" in param and raw_val not in param["options"]:
+        # Check if value is in allowed options
+        if options is not None and raw_val not in options:
+            raise ParameterError(invalid_option_msg, param_info=f"Received: {raw_val}",
+                                 suggestion=options_suggestion)
+        return raw_val
+    return validate
+
+def _compile_select_validator(param):
+    options = frozenset(param["options"]) if "options" in param else None
+    
+    invalid_msg = f"Invalid selection for {param['name']}"
+    options_suggestion = f"Please select one of: {', '.join(param.get('options', ()))}"
+    
+    def validate(raw_val):
+        if options is not None and raw_val not in options:
+            raise ParameterError(invalid_msg, param_info=f"Received: {raw_val}",
+                                 suggestion=options_suggestion)
+        return raw_val
+    return validate
+
+def _passthrough(raw_val):
+    return raw_val
+
+def _compile_validators(plugin):
+    """
+    Compile a plugin's parameter schema into a tuple of
+    (name, type, default, validator) entries so per-request validation
+    does not have to re-dispatch on the schema.
+    """
+    compiled = []
+    for param in plugin["parameters"]:
+        param_type = param["type"]
+        if param_type == "int":
+            validator = _compile_number_validator(param, int, "integer", "Please provide a valid integer value.")
+        elif param_type == "float":
+            validator = _compile_number_validator(param, float, "float", "Please provide a valid decimal number.")
+        elif param_type == "bool":
+            validator = _compile_bool_validator(param)
+        elif param_type == "str":
+            validator = _compile_str_validator(param)
+        elif param_type == "select":
+            validator = _compile_select_validator(param)
+        else:
+            # For unrecognized types, just pass through the value
+            validator = _passthrough
+        compiled.append((param["name"], param_type, param.get("default", _NO_DEFAULT), validator))
+    return tuple(compiled)
+
+def validate_parameters(plugin, params):
+    """Enhanced parameter validation with detailed error messages"""
+    validators = plugin.get("_validators")
+    if validators is None:
+        validators = plugin["_validators"] = _compile_validators(plugin)
+    
+    validated_params = {}
+    for param_name, param_type, default, validate in validators:
+        if param_name not in params:
+            # Check if required parameter is missing
+            if default is _NO_DEFAULT:
                 raise ParameterError(
-                    f"Invalid option for {param_name}",
-                    param_info=f"Received: {raw_val}",
-                    suggestion=f"Allowed options are: {', '.join(param['options'])}"
+                    f"Missing required parameter: {param_name}",
+                    param_info=f"{param_name} ({param_type})",
+                    suggestion="Please provide a value for this required parameter."
                 )
-                
-            validated_params[param_name] = raw_val
+            # Use default if parameter is missing
+            validated_params[param_name] = default
+            continue
         
-        elif param["type"] == "select":
-            if "options" in param and raw_val not in param["options"]:
-                raise ParameterError(
-                    f"Invalid selection for {param_name}",
-                    param_info=f"Received: {raw_val}",
-                    suggestion=f"Please select one of: {', '.join(param['options'])}"
-                )
-            validated_params[param_name] = raw_val
-            
-        else:
-            # For unrecognized types, just pass through the value
-            validated_params[param_name] = raw_val
-            
+        validated_params[param_name] = validate(params[param_name])
+    
     return validated_params
 
 
@@ -404,14 +587,7 @@ PLUGINS = {
             {'name': 'noise', 'type': 'float', 'default': 0.0, 'description': 'Noise level (0.0 - 0.2)',"min": 0, "max": 0.2},
             {'name': 'dimension', 'type': 'int', 'default': 4, 'description': 'Lattice dimension parameter',"min": 1, "max": 32}
         ],
-        'function': generate_quantum_fingerprint_cirq,
-        # Standardized runner to match other plugins and Socket.IO flow
-        'run': lambda p: run_plugin(
-            generate_quantum_fingerprint_cirq,
-            _plugin_key="auth",
-            data=p.get("username", "Bob"),
-            num_qubits=p.get("dimension", 4)
-        )
+        'function': generate_quantum_fingerprint_cirq
     },
 
     "bb84": {
@@ -442,16 +618,7 @@ PLUGINS = {
             
             {"name": "detailed_simulation", "type": "bool", "default": True, 
             "description": "Run detailed quantum simulation"}
-        ],
-        "run": lambda p: run_plugin(bb84_protocol_cirq, 
-                                _plugin_key="bb84",
-                                num_bits=p["num_bits"],
-                                distance_km=p["distance_km"],
-                                hardware_type=p["hardware_type"],
-                                eve_present=p["eve_present"] if isinstance(p["eve_present"], bool) else p["eve_present"].lower() == "true",
-                                eve_strategy=p["eve_strategy"],
-                                detailed_simulation=p["detailed_simulation"] if isinstance(p["detailed_simulation"], bool) else p["detailed_simulation"].lower() == "true",
-                                noise_prob=p["noise"])
+        ]
     },
     
     "shor": {
@@ -462,8 +629,7 @@ PLUGINS = {
         "parameters": [
             {"name": "noise", "type": "float", "default": 0.01, "description": "Noise probability",
              "min": 0.0, "max": 0.3}
-        ],
-        "run": lambda p: run_plugin(run_shor_code, _plugin_key="shor", noise_prob=p["noise"])
+        ]
     },
     
     "grover": {
@@ -478,8 +644,7 @@ PLUGINS = {
              "max_length": 8},
             {"name": "noise", "type": "float", "default": 0.0, "description": "Noise probability",
              "min": 0.0, "max": 0.3}
-        ],
-        "run": lambda p: run_plugin(run_grover, _plugin_key="grover", n=p["n"], target_state=p["target_state"], noise_prob=p["noise"])
+        ]
     },
     
     "handshake": {
@@ -490,8 +655,7 @@ PLUGINS = {
         "parameters": [
             {"name": "noise", "type": "float", "default": 0.0, "description": "Noise probability",
              "min": 0.0, "max": 0.3}
-        ],
-        "run": lambda p: run_plugin(handshake_cirq, _plugin_key="handshake", noise_prob=p["noise"])
+        ]
     },
     
     "network": {
@@ -502,8 +666,7 @@ PLUGINS = {
         "parameters": [
             {"name": "noise", "type": "float", "default": 0.0, "description": "Noise probability",
              "min": 0.0, "max": 0.3}
-        ],
-        "run": lambda p: run_plugin(entanglement_swapping_cirq, _plugin_key="network", noise_prob=p["noise"])
+        ]
     },
     
     "qrng": {
@@ -523,14 +686,7 @@ PLUGINS = {
              "description": "Apply bias correction"},
             {"name": "hardware_simulation", "type": "bool", "default": False, 
              "description": "Add timing delays"}
-        ],
-        "run": lambda p: run_plugin(generate_random_number_cirq, 
-                                  _plugin_key="qrng", 
-                                  num_bits=p["num_bits"],
-                                  source_type=p["source_type"],
-                                  noise_level=p["noise_level"],
-                                  enable_post_processing=p["enable_post_processing"] if isinstance(p["enable_post_processing"], bool) else p["enable_post_processing"].lower() == "true",
-                                  hardware_simulation=p["hardware_simulation"] if isinstance(p["hardware_simulation"], bool) else p["hardware_simulation"].lower() == "true")
+        ]
     },
     
     "teleport": {
@@ -541,8 +697,7 @@ PLUGINS = {
         "parameters": [
             {"name": "noise", "type": "float", "default": 0.0, "description": "Noise probability",
              "min": 0.0, "max": 0.3}
-        ],
-        "run": lambda p: run_plugin(teleportation_circuit, _plugin_key="teleport", noise_prob=p["noise"])
+        ]
     },
     
     "vqe": {
@@ -559,13 +714,7 @@ PLUGINS = {
             "min": 1, "max": 5},
             {"name": "bond_distance", "type": "float", "default": 0.7414, "description": "H-H bond distance (Å)",
             "min": 0.0, "max": 2.5}
-        ],
-        "run": lambda p: run_plugin(run_vqe, 
-                                _plugin_key="vqe", 
-                                num_qubits=p["num_qubits"], 
-                                noise_prob=p["noise_prob"], 
-                                max_iter=p["max_iter"],
-                                bond_distance=p["bond_distance"])
+        ]
     },
     
     "quantum_decryption_grover": {
@@ -580,8 +729,7 @@ PLUGINS = {
              "min": 1, "max": 8},
             {"name": "noise", "type": "float", "default": 0.0, "description": "Noise probability",
              "min": 0.0, "max": 0.3}
-        ],
-        "run": lambda p: run_plugin(grover_key_search, _plugin_key="quantum_decryption_grover", key=p["key"], num_bits=p["num_bits"], noise_prob=p["noise"])
+        ]
     },
     
     "quantum_decryption_shor": {
@@ -592,8 +740,7 @@ PLUGINS = {
         "parameters": [
             {"name": "N", "type": "int", "default": 15, "description": "Composite number",
              "min": 4, "max": 100}
-        ],
-        "run": lambda p: run_plugin(shor_factorization, _plugin_key="quantum_decryption_shor", N=p["N"])
+        ]
     },
     
     "deutsch_jozsa": {
@@ -608,8 +755,7 @@ PLUGINS = {
              "options": ["constant_0", "constant_1", "balanced", "random"], "max_length": 10},
             {"name": "noise", "type": "float", "default": 0.0, "description": "Noise probability",
              "min": 0.0, "max": 0.3}
-        ],
-        "run": lambda p: run_plugin(deutsch_jozsa_cirq, _plugin_key="deutsch_jozsa", n_qubits=p["n_qubits"], oracle_type=p["oracle_type"], noise_prob=p["noise"])
+        ]
     },
 
     "qft": {
@@ -626,9 +772,7 @@ PLUGINS = {
              "options": ["True", "False"], "max_length": 5},
             {"name": "noise", "type": "float", "default": 0.0, "description": "Noise probability",
              "min": 0.0, "max": 0.3}
-        ],
-        "run": lambda p: run_plugin(run_qft, _plugin_key="qft", n_qubits=p["n_qubits"], input_state=p["input_state"], 
-                                    include_inverse=p["include_inverse"].lower() == "true", noise_prob=p["noise"])
+        ]
     },
 
     "phase_estimation": {
@@ -643,9 +787,7 @@ PLUGINS = {
              "min": 0.0, "max": 1.0},
             {"name": "noise", "type": "float", "default": 0.0, "description": "Noise probability",
              "min": 0.0, "max": 0.3}
-        ],
-        "run": lambda p: run_plugin(run_phase_estimation, _plugin_key="phase_estimation", precision_bits=p["precision_bits"], 
-                                    target_phase=p["target_phase"], noise_prob=p["noise"])
+        ]
     },
 
     "qaoa": {
@@ -664,63 +806,176 @@ PLUGINS = {
              "min": 0.0, "max": 0.3},
             {"name": "num_samples", "type": "int", "default": 100, "description": "Number of samples",
              "min": 10, "max": 500}
-        ],
-        "run": lambda p: run_plugin(run_qaoa, _plugin_key="qaoa", n_nodes=p["n_nodes"], edge_probability=p["edge_probability"], 
-                                    p_layers=p["p_layers"], noise_prob=p["noise"], num_samples=p["num_samples"])
+        ]
     }
 }
 
+# --- Plugin Dispatch ---
+# Maps each plugin to its simulation function and the keyword arguments it is
+# called with. An argument source is either the name of a validated parameter
+# or a callable computing the argument from the validated parameters.
+PLUGIN_DISPATCH = {
+    "auth": (generate_quantum_fingerprint_cirq, {"data": "username", "num_qubits": "dimension"}),
+    "bb84": (bb84_protocol_cirq, {
+        "num_bits": "num_bits",
+        "distance_km": "distance_km",
+        "hardware_type": "hardware_type",
+        "eve_present": "eve_present",
+        "eve_strategy": "eve_strategy",
+        "detailed_simulation": "detailed_simulation",
+        "noise_prob": "noise",
+    }),
+    "shor": (run_shor_code, {"noise_prob": "noise"}),
+    "grover": (run_grover, {"n": "n", "target_state": "target_state", "noise_prob": "noise"}),
+    "handshake": (handshake_cirq, {"noise_prob": "noise"}),
+    "network": (entanglement_swapping_cirq, {"noise_prob": "noise"}),
+    "qrng": (generate_random_number_cirq, {
+        "num_bits": "num_bits",
+        "source_type": "source_type",
+        "noise_level": "noise_level",
+        "enable_post_processing": "enable_post_processing",
+        "hardware_simulation": "hardware_simulation",
+    }),
+    "teleport": (teleportation_circuit, {"noise_prob": "noise"}),
+    "vqe": (run_vqe, {
+        "num_qubits": "num_qubits",
+        "noise_prob": "noise_prob",
+        "max_iter": "max_iter",
+        "bond_distance": "bond_distance",
+    }),
+    "quantum_decryption_grover": (grover_key_search, {"key": "key", "num_bits": "num_bits", "noise_prob": "noise"}),
+    "quantum_decryption_shor": (shor_factorization, {"N": "N"}),
+    "deutsch_jozsa": (deutsch_jozsa_cirq, {
+        "n_qubits": "n_qubits",
+        "oracle_type": "oracle_type",
+        "noise_prob": "noise",
+        # A fixed oracle without noise always yields the same measurement
+        "_cacheable": lambda p: p["noise"] == 0 and p["oracle_type"] != "random",
+    }),
+    "qft": (run_qft, {
+        "n_qubits": "n_qubits",
+        "input_state": "input_state",
+        "include_inverse": lambda p: p["include_inverse"].strip().lower() in _TRUE_STRINGS,
+        "noise_prob": "noise",
+    }),
+    "phase_estimation": (run_phase_estimation, {
+        "precision_bits": "precision_bits",
+        "target_phase": "target_phase",
+        "noise_prob": "noise",
+        # Phases exactly representable in precision_bits are measured with certainty
+        "_cacheable": lambda p: p["noise"] == 0 and float(p["target_phase"] * 2 ** p["precision_bits"]).is_integer(),
+    }),
+    "qaoa": (run_qaoa, {
+        "n_nodes": "n_nodes",
+        "edge_probability": "edge_probability",
+        "p_layers": "p_layers",
+        "noise_prob": "noise",
+        "num_samples": "num_samples",
+    }),
+}
+
+def _make_runner(plugin_key, sim_func, arg_map):
+    """
+    Build the runner for a plugin from its dispatch entry.
+    The runner expects parameters already checked by validate_parameters.
+    """
+    param_args = tuple((arg, src) for arg, src in arg_map.items() if isinstance(src, str))
+    computed_args = tuple((arg, src) for arg, src in arg_map.items() if callable(src))
+    
+    def run(params):
+        kwargs = {arg: params[name] for arg, name in param_args}
+        for arg, compute in computed_args:
+            kwargs[arg] = compute(params)
+        return run_plugin(sim_func.resolve(), _plugin_key=plugin_key, **kwargs)
+    return run
+
+# Compile parameter validators and runners once at import time
+for _key, _plugin in PLUGINS.items():
+    _plugin["_validators"] = _compile_validators(_plugin)
+    _plugin["run"] = _make_runner(_key, *PLUGIN_DISPATCH[_key])
+
+def warm_plugins():
+    """Import every plugin module in the background so first requests don't pay for it."""
+    for sim_func, _ in PLUGIN_DISPATCH.values():
+        try:
+            sim_func.resolve()
+        except Exception as e:
+            logger.error(f"Error importing plugin {sim_func.module_path}: {e}")
+
+socketio.start_background_task(warm_plugins)
+
+# Educational template for each plugin, relative to the templates directory
+_EDU_TEMPLATES = {
+    'bb84': 'educational/bb84.html',
+    'teleport': 'educational/teleport.html',
+    'grover': 'educational/grover.html',
+    'handshake': 'educational/handshake.html',
+    'auth': 'educational/auth.html',
+    'network': 'educational/network.html',
+    'qrng': 'educational/qrng.html',
+    'shor': 'educational/shor.html',
+    'vqe': 'educational/vqe.html',
+    'quantum_decryption_grover': 'educational/grover.html',
+    'quantum_decryption_shor': 'educational/shor.html',
+    'deutsch_jozsa': 'educational/deutsch_jozsa.html',
+    'qft': 'educational/qft.html',
+    'phase_estimation': 'educational/phase_estimation.html',
+    'qaoa': 'educational/qaoa.html',
+}
+
+# Full template paths resolved once at import time, independent of the working directory
+_TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+_DEFAULT_EDU_TEMPLATE = os.path.join(_TEMPLATES_DIR, 'educational/default.html')
+_EDU_TEMPLATE_PATHS = {key: os.path.join(_TEMPLATES_DIR, name) for key, name in _EDU_TEMPLATES.items()}
+
 def get_template_path(plugin_key):
     """
     Returns the appropriate template file path for the plugin's educational content.
     This function only returns the path, it doesn't extract content.
     """
-    templates = {
-        'bb84': 'educational/bb84.html',
-        'teleport': 'educational/teleport.html',
-        'grover': 'educational/grover.html',
-        'handshake': 'educational/handshake.html',
-        'auth': 'educational/auth.html',
-        'network': 'educational/network.html',
-        'qrng': 'educational/qrng.html',
-        'shor': 'educational/shor.html',
-        'vqe': 'educational/vqe.html',
-        'quantum_decryption_grover': 'educational/grover.html',
-        'quantum_decryption_shor': 'educational/shor.html',
-        'deutsch_jozsa': 'educational/deutsch_jozsa.html',
-        'qft': 'educational/qft.html',
-        'phase_estimation': 'educational/phase_estimation.html',
-        'qaoa': 'educational/qaoa.html',
-    }
-    
-    # Return the template path or a default
-    template_name = templates.get(plugin_key, 'educational/default.html')
-    return os.path.join('templates', template_name)
+    return _EDU_TEMPLATE_PATHS.get(plugin_key, _DEFAULT_EDU_TEMPLATE)
+
+# Marker blocks in the educational templates
+_EDU_MARKERS = ('<!-- EDUCATIONAL-CONTENT BEGIN -->', '<!-- EDUCATIONAL-CONTENT END -->')
+_MINI_MARKERS = ('<!-- MINI_EXPLANATION_START -->', '<!-- MINI_EXPLANATION_END -->')
+
+def _extract_between(template_path, markers):
+    """
+    Returns the stripped text between the first begin marker and the end marker after it,
+    or None if either marker is missing.
+    The whole file is read: each template is read only once, at startup.
+    """
+    begin, end = markers
+    text = Path(template_path).read_text(encoding='utf-8')
+    i = text.find(begin)
+    if i < 0:
+        return None
+    i += len(begin)
+    j = text.find(end, i)
+    if j < 0:
+        return None
+    return text[i:j].strip()
 
+# The extractors run once per template from _preload_templates, and the
+# request handlers read _TEMPLATE_CACHE, so the extractors are not memoized
 def extract_educational_content(template_path):
     """
     Extracts the full educational content from a template file.
     Looks for content between <!-- EDUCATIONAL-CONTENT BEGIN --> and <!-- EDUCATIONAL-CONTENT END -->
     """
     try:
-        if not os.path.exists(template_path):
-            logger.warning(f"Template file not found: {template_path}")
-            return None
-            
-        with open(template_path, 'r') as f:
-            content = f.read()
-            
-        # Use regex to extract content between markers
-        content_pattern = re.compile(r'<!-- EDUCATIONAL-CONTENT BEGIN -->(.*?)<!-- EDUCATIONAL-CONTENT END -->', 
-                                    re.DOTALL)
-        match = content_pattern.search(content)
+        # Extract content between markers
+        extracted = _extract_between(template_path, _EDU_MARKERS)
         
-        if match:
-            return match.group(1).strip()
+        if extracted is not None:
+            return extracted
         else:
             logger.warning(f"Educational content markers not found in {template_path}")
             return None
             
+    except FileNotFoundError:
+        logger.warning(f"Template file not found: {template_path}")
+        return None
     except Exception as e:
         logger.error(f"Error extracting educational content: {e}")
         return None
@@ -730,28 +985,15 @@ def extract_mini_explanation(template_path):
     Extracts mini explanation from a template file.
     """
     try:
-        if not os.path.exists(template_path):
-            logger.warning(f"Template file not found: {template_path}")
-            return None
-            
-        with open(template_path, 'r') as f:
-            content = f.read()
-        
-        # Try all possible marker formats
-        marker_patterns = [
-            r'<!-- MINI_EXPLANATION_START -->(.*?)<!-- MINI_EXPLANATION_END -->'
-        ]
-        
-        for pattern in marker_patterns:
-            mini_pattern = re.compile(pattern, re.DOTALL)
-            match = mini_pattern.search(content)
-            
-            if match:
-                logger.info(f"Found mini explanation using pattern: {pattern}")
-                return match.group(1).strip()
+        extracted = _extract_between(template_path, _MINI_MARKERS)
+        if extracted is not None:
+            return extracted
         
         logger.warning(f"No mini explanation markers found in {template_path}")
         return None
+    except FileNotFoundError:
+        logger.warning(f"Template file not found: {template_path}")
+        return None
     except Exception as e:
         logger.error(f"Error extracting mini explanation: {e}")
         return None
@@ -761,11 +1003,7 @@ def get_mini_explanation(plugin_key):
     Gets the mini explanation for a plugin, either from its template file
     or returns a default explanation based on the plugin info.
     """
-    # Get the template path
-    template_path = get_template_path(plugin_key)
-    
-    # Try to extract from template file
-    mini_content = extract_mini_explanation(template_path)
+    mini_content = _TEMPLATE_CACHE.get(plugin_key, (None, None))[1]
     
     if mini_content:
         return mini_content
@@ -786,15 +1024,119 @@ def get_educational_content(plugin_key):
     """
     Gets the educational content for a plugin's modal.
     """
-    template_path = get_template_path(plugin_key)
-    print(f"Template path: {template_path}")
-    return extract_educational_content(template_path)
+    return _TEMPLATE_CACHE.get(plugin_key, (None, None))[0]
+
+# plugin_key -> (educational HTML, mini explanation HTML), extracted once at startup
+_TEMPLATE_CACHE = {}
+
+# Serialized /api/educational response body and its ETag for each plugin
+_EDU_PAYLOADS = {}
+
+def content_etag(payload):
+    """Short content hash of a response body, used as its ETag."""
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+def compressed_variants(payload):
+    """
+    Compress a static response body once, ahead of serving it.
+    Returns (content_encoding, body) pairs, best first, ending with the uncompressed body.
+    Encodings that would not shrink the body are dropped.
+    """
+    variants = []
+    if brotli is not None:
+        variants.append(('br', brotli.compress(payload, quality=11)))
+    variants.append(('gzip', gzip.compress(payload, compresslevel=9, mtime=0)))
+    return [(encoding, body) for encoding, body in variants if len(body) < len(payload)] + [(None, payload)]
+
+def send_precompressed(variants, mimetype, etag=None):
+    """
+    Send the best precompressed variant the client accepts.
+    With an ETag, conditional requests are answered with a 304.
+    """
+    accepted = request.accept_encodings
+    encoding, body = next(
+        (encoding, body) for encoding, body in variants
+        if encoding is None or accepted[encoding] > 0
+    )
+    response = app.response_class(body, mimetype=mimetype)
+    response.vary.add('Accept-Encoding')
+    if encoding is not None:
+        response.content_encoding = encoding
+    if etag is not None:
+        # Each encoding is a different representation, so it needs its own tag
+        response.set_etag(f"{etag}-{encoding}" if encoding else etag)
+        response = response.make_conditional(request)
+    return response
+
+def _preload_templates():
+    """Read and extract every plugin's educational template once at startup."""
+    for plugin_key in PLUGINS:
+        template_path = get_template_path(plugin_key)
+        content = extract_educational_content(template_path)
+        _TEMPLATE_CACHE[plugin_key] = (content, extract_mini_explanation(template_path))
+        if content:
+            payload = json.dumps({"content": content}).encode('utf-8')
+            _EDU_PAYLOADS[plugin_key] = (payload, content_etag(payload))
+
+_preload_templates()
 
 # --- Route handlers ---
+_spa_index = None  # (compressed variants, etag) of the React index.html, read on first use
+
+def serve_spa_index():
+    """
+    Serve the React index.html for client-side routes.
+    The file is read from disk once; conditional requests get a 304.
+    """
+    global _spa_index
+    if _spa_index is None:
+        try:
+            with open(os.path.join(app.static_folder, 'index.html'), 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            raise NotFound()
+        _spa_index = (compressed_variants(data), content_etag(data))
+    
+    variants, etag = _spa_index
+    return send_precompressed(variants, 'text/html', etag)
+
 @app.route("/")
 def index():
     # Serve React index.html
-    return send_from_directory(app.static_folder, 'index.html')
+    return serve_spa_index()
+
+def _build_sitemap_template():
+    """
+    Build the sitemap XML once, leaving {base_url} and {today} as placeholders
+    since the plugin and category set never changes at runtime.
+    """
+    def url_entry(path, changefreq, priority):
+        return ('  <url>\n'
+                f'    <loc>{{base_url}}{path}</loc>\n'
+                '    <lastmod>{today}</lastmod>\n'
+                f'    <changefreq>{changefreq}</changefreq>\n'
+                f'    <priority>{priority}</priority>\n'
+                '  </url>')
+    
+    entries = ['<?xml version="1.0" encoding="UTF-8"?>',
+               '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+               url_entry('/', 'weekly', '1.0'),
+               # Add glossary page
+               url_entry('/glossary', 'monthly', '0.8')]
+    
+    # Add all plugin pages
+    entries.extend(url_entry(f'/plugin/{plugin_key}', 'monthly', '0.8') for plugin_key in PLUGINS)
+    
+    # Add category pages
+    categories = sorted(set(plugin.get("category", "other") for plugin in PLUGINS.values()))
+    entries.extend(url_entry(f'/category/{category}', 'monthly', '0.7') for category in categories)
+    
+    entries.append('</urlset>')
+    return '\n'.join(entries)
+
+_SITEMAP_TEMPLATE = _build_sitemap_template()
+
+_sitemap_cache = None  # ((base_url, date), compressed variants) of the last sitemap served
 
 @app.route('/sitemap.xml')
 def sitemap():
@@ -806,75 +1148,36 @@ def sitemap():
         base_url = request.url_root.rstrip('/')
     
     # Current date for lastmod
-    import datetime
-    today = datetime.date.today().isoformat()
-    
-    # Build the sitemap XML string
-    xml = ['<?xml version="1.0" encoding="UTF-8"?>',
-           '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
-           '  <url>',
-           f'    <loc>{base_url}/</loc>',
-           f'    <lastmod>{today}</lastmod>',
-           '    <changefreq>weekly</changefreq>',
-           '    <priority>1.0</priority>',
-           '  </url>']
-    
-     # Add glossary page
-    xml.append('  <url>')
-    xml.append(f'    <loc>{base_url}/glossary</loc>')
-    xml.append(f'    <lastmod>{today}</lastmod>')
-    xml.append('    <changefreq>monthly</changefreq>')
-    xml.append('    <priority>0.8</priority>')
-    xml.append('  </url>')
+    today = date.today().isoformat()
     
+    # The sitemap only changes with the host and the date, so compress it once per pair
+    global _sitemap_cache
+    if _sitemap_cache is None or _sitemap_cache[0] != (base_url, today):
+        xml = _SITEMAP_TEMPLATE.format(base_url=base_url, today=today).encode('utf-8')
+        _sitemap_cache = ((base_url, today), compressed_variants(xml))
     
-    # Add all plugin pages with categorization
-    for plugin_key, plugin in PLUGINS.items():
-        # Group plugins by category for better SEO
-        category = plugin.get("category", "other")
-        xml.append('  <url>')
-        xml.append(f'    <loc>{base_url}/plugin/{plugin_key}</loc>')
-        xml.append(f'    <lastmod>{today}</lastmod>')
-        xml.append('    <changefreq>monthly</changefreq>')
-        xml.append('    <priority>0.8</priority>')
-        xml.append('  </url>')
-    
-    # Add category pages if you implement them
-    categories = set(plugin.get("category", "other") for plugin in PLUGINS.values())
-    for category in categories:
-        xml.append('  <url>')
-        xml.append(f'    <loc>{base_url}/category/{category}</loc>')
-        xml.append(f'    <lastmod>{today}</lastmod>')
-        xml.append('    <changefreq>monthly</changefreq>')
-        xml.append('    <priority>0.7</priority>')
-        xml.append('  </url>')
-    
-    xml.append('</urlset>')
-    
-    return app.response_class(
-        response='\n'.join(xml),
-        status=200,
-        mimetype='application/xml'
-    )
+    return send_precompressed(_sitemap_cache[1], 'application/xml')
 
 @app.route("/sitemap")
 def html_sitemap():
     # Serve SPA index for HTML sitemap requests
-    return send_from_directory(app.static_folder, 'index.html')
+    return serve_spa_index()
+
+_ROBOTS_TEMPLATE = """User-agent: *
+Allow: /
+
+Sitemap: {base_url}/sitemap.xml
+"""
+_ROBOTS_PRODUCTION = _ROBOTS_TEMPLATE.format(base_url="https://quantumfieldkit.com")
 
 @app.route('/robots.txt')
 def robots():
     """Serve robots.txt dynamically."""
     if app.config.get('ENV') == 'production':
-        base_url = "https://quantumfieldkit.com"
+        robots_txt = _ROBOTS_PRODUCTION
     else:
-        base_url = request.url_root.rstrip('/')
+        robots_txt = _ROBOTS_TEMPLATE.format(base_url=request.url_root.rstrip('/'))
     
-    robots_txt = f"""User-agent: *
-Allow: /
-
-Sitemap: {base_url}/sitemap.xml
-"""
     return app.response_class(
         response=robots_txt,
         status=200,
@@ -883,22 +1186,25 @@ Sitemap: {base_url}/sitemap.xml
 
 @app.route("/category/<category>")
 def category_view(category):
-    return send_from_directory(app.static_folder, 'index.html')
+    return serve_spa_index()
 
 @app.route("/glossary")
 def glossary():
-    return send_from_directory(app.static_folder, 'index.html')
+    return serve_spa_index()
 
 @app.after_request
 def add_cache_headers(response):
     """Add cache headers to responses to improve performance."""
-    import datetime
     # Don't cache dynamic content
     if request.path.startswith('/static/'):
         # Cache static files for 1 week
-        expiry = datetime.datetime.now() + datetime.timedelta(days=7)
         response.headers['Cache-Control'] = 'public, max-age=604800'
-        response.headers['Expires'] = expiry.strftime("%a, %d %b %Y %H:%M:%S GMT")
+        response.headers['Expires'] = time.strftime("%a, %d %b %Y %H:%M:%S GMT",
+                                                   time.gmtime(time.time() + 604800))
+    elif request.method == 'GET' and response.headers.get('ETag'):
+        # File responses (e.g. the SPA shell) are identical between requests,
+        # so let browsers revalidate them and receive a 304
+        response.headers.setdefault('Cache-Control', 'no-cache')
     else:
         # Don't cache dynamic content
         response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
@@ -926,45 +1232,44 @@ def plugin_view(plugin_key):
         except Exception as e:
             return jsonify({"error": str(e)}), 400
     # GET falls back to React
-    return send_from_directory(app.static_folder, 'index.html')
+    return serve_spa_index()
+
+def _serializable_plugin(key, plugin):
+    """Only include serializable data"""
+    return {
+        "key": key,
+        "name": plugin.get("name"),
+        "description": plugin.get("description"),
+        "icon": plugin.get("icon"),
+        "category": plugin.get("category"),
+        "parameters": plugin.get("parameters", [])
+    }
+
+def _build_plugin_payloads():
+    """Serialize the plugin listing and each plugin's details once, as JSON bytes."""
+    categories = {}
+    by_key = {}
+    for key, plugin in PLUGINS.items():
+        serializable_plugin = _serializable_plugin(key, plugin)
+        categories.setdefault(plugin.get("category", "other"), []).append(serializable_plugin)
+        by_key[key] = app.json.dumps(serializable_plugin).encode('utf-8')
+    return app.json.dumps(categories).encode('utf-8'), by_key
+
+_PLUGINS_JSON, _PLUGIN_JSON_BY_KEY = _build_plugin_payloads()
+_PLUGINS_JSON_VARIANTS = compressed_variants(_PLUGINS_JSON)
 
 @app.route("/api/plugins", methods=["GET"])
 def api_plugins():
     """Return a list of available plugins."""
-    categories = {}
-    for key, plugin in PLUGINS.items():
-        category = plugin.get("category", "other")
-        if category not in categories:
-            categories[category] = []
-        # Only include serializable data
-        serializable_plugin = {
-            "key": key,
-            "name": plugin.get("name"),
-            "description": plugin.get("description"),
-            "icon": plugin.get("icon"),
-            "category": plugin.get("category"),
-            "parameters": plugin.get("parameters", [])
-        }
-        categories[category].append(serializable_plugin)
-    return jsonify(categories)
+    return send_precompressed(_PLUGINS_JSON_VARIANTS, 'application/json')
 
 @app.route("/api/plugin/<plugin_key>", methods=["GET"])
 def api_plugin(plugin_key):
     """Return details for a specific plugin."""
-    if plugin_key not in PLUGINS:
+    if plugin_key not in _PLUGIN_JSON_BY_KEY:
         return jsonify({"error": "Plugin not found"}), 404
     
-    plugin = PLUGINS[plugin_key]
-    # Only include serializable data
-    serializable_plugin = {
-        "key": plugin_key,
-        "name": plugin.get("name"),
-        "description": plugin.get("description"),
-        "icon": plugin.get("icon"),
-        "category": plugin.get("category"),
-        "parameters": plugin.get("parameters", [])
-    }
-    return jsonify(serializable_plugin)
+    return app.response_class(_PLUGIN_JSON_BY_KEY[plugin_key], mimetype='application/json')
 
 @app.route("/api/run/<plugin_key>", methods=["POST"])
 def api_run_plugin(plugin_key):
@@ -976,7 +1281,7 @@ def api_run_plugin(plugin_key):
         plugin = PLUGINS[plugin_key]
         if 'run' in plugin and callable(plugin['run']):
             # Use standardized runner which already wraps results
-            result = plugin['run'](params or {})
+            result = plugin['run'](validate_parameters(plugin, params or {}))
         elif 'function' in plugin and callable(plugin['function']):
             # Fallback for legacy plugins
             result = run_plugin(plugin['function'], _plugin_key=plugin_key, **(params or {}))
@@ -986,24 +1291,65 @@ def api_run_plugin(plugin_key):
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
-@app.route("/api/glossary", methods=["GET"])
-def api_glossary():
-    """Return glossary terms."""
-    # Prefer glossary shipped with the built SPA, then public, then repo static fallback
+# Served when no glossary file can be loaded
+_FALLBACK_GLOSSARY = json.dumps([
+    {"term": "Qubit", "definition": "The fundamental unit of quantum information."},
+    {"term": "Superposition", "definition": "A quantum property allowing particles to exist in multiple states."}
+]).encode('utf-8')
+
+_glossary_payload = None
+_glossary_variants = None
+_glossary_etag = None
+
+def static_json_response(variants, etag, max_age=3600):
+    """
+    Return preserialized JSON bytes with an ETag.
+    Answers 304 with an empty body when the client already holds this version.
+    """
+    response = send_precompressed(variants, 'application/json', etag)
+    response.headers['Cache-Control'] = f'public, max-age={max_age}'
+    return response
+
+def _load_glossary():
+    """
+    Returns the glossary as JSON bytes, reading the file only on first use.
+    Prefers the glossary shipped with the built SPA, then public, then the repo static fallback.
+    """
+    global _glossary_payload, _glossary_variants, _glossary_etag
+    if _glossary_payload is not None:
+        return _glossary_payload
+    
+    base_dir = os.path.dirname(__file__)
     candidates = [
-        os.path.join(os.path.dirname(__file__), 'frontend', 'build', 'data', 'glossary_terms.json'),
-        os.path.join(os.path.dirname(__file__), 'frontend', 'public', 'data', 'glossary_terms.json'),
-        os.path.join(os.path.dirname(__file__), 'static', 'data', 'glossary_terms.json'),
+        os.path.join(base_dir, 'frontend', 'build', 'data', 'glossary_terms.json'),
+        os.path.join(base_dir, 'frontend', 'public', 'data', 'glossary_terms.json'),
+        os.path.join(base_dir, 'static', 'data', 'glossary_terms.json'),
     ]
-    terms_file = next((p for p in candidates if os.path.exists(p)), None)
     try:
-        with open(terms_file, 'r') as f:
-            terms = json.load(f)
-        return jsonify(terms)
+        for terms_file in candidates:
+            try:
+                with open(terms_file, 'rb') as f:
+                    payload = f.read()
+                break
+            except FileNotFoundError:
+                continue
+        else:
+            raise FileNotFoundError("glossary_terms.json not found")
+        # Validate once so a malformed file is never served
+        json.loads(payload)
+        _glossary_payload = payload
     except (FileNotFoundError, json.JSONDecodeError) as e:
         app.logger.error(f"Error loading glossary terms: {e}")
-        return jsonify([{"term": "Qubit", "definition": "The fundamental unit of quantum information."},
-                       {"term": "Superposition", "definition": "A quantum property allowing particles to exist in multiple states."}])
+        _glossary_payload = _FALLBACK_GLOSSARY
+    _glossary_variants = compressed_variants(_glossary_payload)
+    _glossary_etag = content_etag(_glossary_payload)
+    return _glossary_payload
+
+@app.route("/api/glossary", methods=["GET"])
+def api_glossary():
+    """Return glossary terms."""
+    _load_glossary()
+    return static_json_response(_glossary_variants, _glossary_etag)
 
 @app.route("/api/category/<category>", methods=["GET"])
 def api_category(category):
@@ -1020,16 +1366,12 @@ def api_educational(plugin_key):
         return jsonify({"error": "Plugin not found"}), 404
     
     try:
-        # Get the template path for the plugin
-        template_path = get_template_path(plugin_key)
-        
-        # Extract educational content
-        content = extract_educational_content(template_path)
+        # Preloaded at startup; plugins without educational content have no entry
+        if plugin_key in _EDU_PAYLOADS:
+            payload, etag = _EDU_PAYLOADS[plugin_key]
+            return static_json_response([(None, payload)], etag)
         
-        if content:
-            return jsonify({"content": content})
-        else:
-            return jsonify({"error": "Educational content not found"}), 404
+        return jsonify({"error": "Educational content not found"}), 404
             
     except Exception as e:
         logger.error(f"Error loading educational content: {e}")
@@ -1062,43 +1404,41 @@ def api_validate(plugin_key):
 @app.route("/circuit")
 def circuit_designer():
     # SPA route
-    return send_from_directory(app.static_folder, 'index.html')
+    return serve_spa_index()
 
 # API routes for Circuit Designer
 
+# Gate catalog for the circuit designer, serialized once
+_CIRCUIT_GATES_JSON = app.json.dumps({
+    "single_qubit": [
+        {"id": "x", "name": "X", "description": "Pauli-X gate (NOT gate)", "symbol": "X"},
+        {"id": "y", "name": "Y", "description": "Pauli-Y gate", "symbol": "Y"},
+        {"id": "z", "name": "Z", "description": "Pauli-Z gate", "symbol": "Z"},
+        {"id": "h", "name": "H", "description": "Hadamard gate", "symbol": "H"},
+        {"id": "s", "name": "S", "description": "Phase gate (S)", "symbol": "S"},
+        {"id": "t", "name": "T", "description": "π/8 gate (T)", "symbol": "T"},
+        {"id": "rx", "name": "RX", "description": "Rotation around X-axis", "symbol": "RX", "params": [{"name": "theta", "default": "π/2"}]},
+        {"id": "ry", "name": "RY", "description": "Rotation around Y-axis", "symbol": "RY", "params": [{"name": "theta", "default": "π/2"}]},
+        {"id": "rz", "name": "RZ", "description": "Rotation around Z-axis", "symbol": "RZ", "params": [{"name": "theta", "default": "π/2"}]}
+    ],
+    "multi_qubit": [
+        {"id": "cnot", "name": "CNOT", "description": "Controlled-NOT gate", "symbol": "CNOT", "qubits": 2},
+        {"id": "cz", "name": "CZ", "description": "Controlled-Z gate", "symbol": "CZ", "qubits": 2},
+        {"id": "swap", "name": "SWAP", "description": "SWAP gate", "symbol": "SWAP", "qubits": 2},
+        {"id": "ccx", "name": "Toffoli", "description": "Toffoli gate (CCX)", "symbol": "CCX", "qubits": 3},
+        {"id": "cswap", "name": "Fredkin", "description": "Fredkin gate (CSWAP)", "symbol": "CSWAP", "qubits": 3}
+    ],
+    "special": [
+        {"id": "measure", "name": "Measure", "description": "Measurement operation", "symbol": "M"},
+        {"id": "reset", "name": "Reset", "description": "Reset qubit to |0⟩", "symbol": "R"}
+    ]
+}).encode('utf-8')
+_CIRCUIT_GATES_VARIANTS = compressed_variants(_CIRCUIT_GATES_JSON)
+
 @app.route("/api/circuit/gates", methods=["GET"])
 def api_circuit_gates():
     """Get available quantum gates for the circuit designer"""
-    try:
-        # Basic set of gates organized by categories
-        gates = {
-            "single_qubit": [
-                {"id": "x", "name": "X", "description": "Pauli-X gate (NOT gate)", "symbol": "X"},
-                {"id": "y", "name": "Y", "description": "Pauli-Y gate", "symbol": "Y"},
-                {"id": "z", "name": "Z", "description": "Pauli-Z gate", "symbol": "Z"},
-                {"id": "h", "name": "H", "description": "Hadamard gate", "symbol": "H"},
-                {"id": "s", "name": "S", "description": "Phase gate (S)", "symbol": "S"},
-                {"id": "t", "name": "T", "description": "π/8 gate (T)", "symbol": "T"},
-                {"id": "rx", "name": "RX", "description": "Rotation around X-axis", "symbol": "RX", "params": [{"name": "theta", "default": "π/2"}]},
-                {"id": "ry", "name": "RY", "description": "Rotation around Y-axis", "symbol": "RY", "params": [{"name": "theta", "default": "π/2"}]},
-                {"id": "rz", "name": "RZ", "description": "Rotation around Z-axis", "symbol": "RZ", "params": [{"name": "theta", "default": "π/2"}]}
-            ],
-            "multi_qubit": [
-                {"id": "cnot", "name": "CNOT", "description": "Controlled-NOT gate", "symbol": "CNOT", "qubits": 2},
-                {"id": "cz", "name": "CZ", "description": "Controlled-Z gate", "symbol": "CZ", "qubits": 2},
-                {"id": "swap", "name": "SWAP", "description": "SWAP gate", "symbol": "SWAP", "qubits": 2},
-                {"id": "ccx", "name": "Toffoli", "description": "Toffoli gate (CCX)", "symbol": "CCX", "qubits": 3},
-                {"id": "cswap", "name": "Fredkin", "description": "Fredkin gate (CSWAP)", "symbol": "CSWAP", "qubits": 3}
-            ],
-            "special": [
-                {"id": "measure", "name": "Measure", "description": "Measurement operation", "symbol": "M"},
-                {"id": "reset", "name": "Reset", "description": "Reset qubit to |0⟩", "symbol": "R"}
-            ]
-        }
-        return jsonify(gates)
-    except Exception as e:
-        logger.error(f"Error getting available gates: {str(e)}")
-        return jsonify({"error": "Failed to get available gates"}), 500
+    return send_precompressed(_CIRCUIT_GATES_VARIANTS, 'application/json')
 
 @app.route("/api/circuit/simulate", methods=["POST"])
 def api_circuit_simulate():
@@ -1125,13 +1465,6 @@ def api_circuit_simulate():
         # This is where we'd build and simulate the circuit using Cirq
         # For now, we'll use mock data
         
-        import numpy as np
-        import cirq
-        
-        # Convert JSON circuit representation to a Cirq circuit
-        cirq_circuit = cirq.Circuit()
-        qubits = [cirq.LineQubit(i) for i in range(circuit.get("num_qubits", 3))]
-        
         # Add gates to circuit based on the circuit data
         # This would need to be implemented based on your circuit JSON schema
         
@@ -1171,13 +1504,14 @@ def api_circuit_save():
         # Here you would save the circuit to a database or file
         # For this example, we'll pretend to save it and return a mock ID
         
-        circuit_id = datetime.now().strftime("%Y%m%d%H%M%S")
+        now = datetime.now()
+        circuit_id = now.strftime("%Y%m%d%H%M%S")
         
         return jsonify({
             "id": circuit_id,
             "name": data.get("name", "Unnamed Circuit"),
             "saved": True,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now.isoformat()
         })
     except Exception as e:
         logger.error(f"Error saving circuit: {str(e)}")
@@ -1207,23 +1541,18 @@ def api_circuit_load(circuit_id):
         logger.error(f"Error loading circuit {circuit_id}: {str(e)}")
         return jsonify({"error": f"Failed to load circuit: {str(e)}"}), 500
 
+# Mock saved circuits until circuits are persisted, serialized once
+_SAVED_CIRCUITS_JSON = app.json.dumps([
+    {"id": "20230512120000", "name": "Bell State", "num_qubits": 2, "created_at": "2023-05-12T12:00:00"},
+    {"id": "20230513130000", "name": "GHZ State", "num_qubits": 3, "created_at": "2023-05-13T13:00:00"},
+    {"id": "20230514140000", "name": "Quantum Teleportation", "num_qubits": 3, "created_at": "2023-05-14T14:00:00"}
+]).encode('utf-8')
+
 @app.route("/api/circuit/saved", methods=["GET"])
 def api_circuit_saved():
     """Get list of saved circuits"""
-    try:
-        # Here you would query a database for saved circuits
-        # For this example, we'll return mock data
-        
-        mock_saved_circuits = [
-            {"id": "20230512120000", "name": "Bell State", "num_qubits": 2, "created_at": "2023-05-12T12:00:00"},
-            {"id": "20230513130000", "name": "GHZ State", "num_qubits": 3, "created_at": "2023-05-13T13:00:00"},
-            {"id": "20230514140000", "name": "Quantum Teleportation", "num_qubits": 3, "created_at": "2023-05-14T14:00:00"}
-        ]
-        
-        return jsonify(mock_saved_circuits)
-    except Exception as e:
-        logger.error(f"Error getting saved circuits: {str(e)}")
-        return jsonify({"error": f"Failed to get saved circuits: {str(e)}"}), 500
+    # Here you would query a database for saved circuits
+    return app.response_class(_SAVED_CIRCUITS_JSON, mimetype='application/json')
 
 @app.route("/api/circuit/export", methods=["POST"])
 def api_circuit_export():
@@ -1362,7 +1691,7 @@ def handle_run_plugin(data):
 def page_not_found(e):
     # SPA fallback
     try:
-        return send_from_directory(app.static_folder, 'index.html')
+        return serve_spa_index()
     except Exception:
         return jsonify({"error": "Not found"}), 404
 
@@ -9,9 +9,13 @@ import cirq
 import hashlib
 import numpy as np
 from cirq.contrib.svg import circuit_to_svg
-import matplotlib.pyplot as plt
 from io import BytesIO
 import base64
+from functools import lru_cache
+
+def hash_polynomial(coefficients):
+    """Hash polynomial coefficients via their canonical int32 byte layout."""
+    return hashlib.sha256(np.ascontiguousarray(coefficients, dtype=np.int32).tobytes()).digest()
 
 class RingLWE:
     """Ring Learning With Errors implementation for authentication."""
@@ -28,29 +32,41 @@ class RingLWE:
         self.n = n
         self.q = q
         self.sigma = sigma
+        # Coefficients are below q < 2^15, so polynomials are stored as int32
+        self.dtype = np.int32
+        self._rng = np.random.default_rng()
+        
+        # Cumulative distribution table of the discrete Gaussian over [-6σ, 6σ],
+        # with the support already reduced mod q
+        bound = int(np.ceil(6 * sigma))
+        support = np.arange(-bound, bound + 1)
+        pmf = np.exp(-support.astype(float) ** 2 / (2 * sigma ** 2))
+        self._cdt = np.cumsum(pmf) / pmf.sum()
+        self._cdt_values = np.mod(support, q).astype(self.dtype)
+        
+    def reseed(self, seed):
+        """Restart the sampler from a seed, for reproducible keys and challenges."""
+        self._rng = np.random.default_rng(seed)
         
     def sample_uniform(self):
         """Sample uniformly from Z_q."""
-        return np.random.randint(0, self.q, self.n)
+        return self._rng.integers(0, self.q, self.n, dtype=self.dtype)
     
     def sample_error(self):
         """Sample from error distribution (discrete Gaussian)."""
-        # Simplified: Using rounded Gaussian with rejection sampling
-        e = np.round(np.random.normal(0, self.sigma, self.n))
-        return np.mod(e.astype(int), self.q)
+        # Inverse-CDF lookup: one uniform draw and one binary search per coefficient
+        idx = np.searchsorted(self._cdt, self._rng.random(self.n))
+        return self._cdt_values[np.minimum(idx, len(self._cdt_values) - 1)]
     
     def polynomial_multiply(self, a, b):
         """Multiply polynomials in the ring."""
         # Using negacyclic convolution (Z_q[x]/(x^n + 1))
-        c = np.zeros(self.n, dtype=int)
-        for i in range(self.n):
-            for j in range(self.n):
-                if i + j < self.n:
-                    c[i + j] = (c[i + j] + a[i] * b[j]) % self.q
-                else:
-                    # Apply the modulus x^n + 1
-                    c[i + j - self.n] = (c[i + j - self.n] - a[i] * b[j]) % self.q
-        return c
+        # Full product accumulated in int64 (n*q^2 can exceed int32), reduced back to int32
+        full = np.convolve(np.asarray(a, dtype=np.int64), np.asarray(b, dtype=np.int64))
+        c = full[:self.n].copy()
+        # Apply the modulus x^n + 1: x^(n+k) wraps to -x^k
+        c[:self.n - 1] -= full[self.n:]
+        return np.mod(c, self.q).astype(self.dtype)
     
     def generate_keys(self, seed=None):
         """
@@ -61,7 +77,7 @@ class RingLWE:
         """
         # Set seed for reproducibility if provided
         if seed is not None:
-            np.random.seed(seed)
+            self.reseed(seed)
             
         # Sample a uniform polynomial (public)
         a = self.sample_uniform()
@@ -87,7 +103,7 @@ class RingLWE:
             Tuple of (challenge, expected_response)
         """
         if seed is not None:
-            np.random.seed(seed)
+            self.reseed(seed)
             
         a, b = public_key
         
@@ -101,7 +117,7 @@ class RingLWE:
         v = (self.polynomial_multiply(b, r) + e2) % self.q
         
         # Expected response is a hash of r
-        expected_response = hashlib.sha256(str(r).encode()).digest()
+        expected_response = hash_polynomial(r)
         
         return ((u, v), expected_response)
     
@@ -122,17 +138,13 @@ class RingLWE:
         # Compute v - u*s (approx ~ e2 - e1*s)
         w = (v - self.polynomial_multiply(u, s)) % self.q
         
-        # Recover r approximately using threshold
-        r_recovered = []
-        for coef in w:
-            # Small coefficients (likely part of e2 - e1*s)
-            if coef <= self.sigma * 10 or coef >= self.q - self.sigma * 10:
-                r_recovered.append(1)  # Simplified recovery
-            else:
-                r_recovered.append(0)
+        # Recover r approximately using threshold:
+        # small coefficients (likely part of e2 - e1*s) map to 1 (simplified recovery)
+        threshold = self.sigma * 10
+        r_recovered = ((w <= threshold) | (w >= self.q - threshold)).astype(np.uint8)
                 
         # Hash the recovered polynomial
-        response = hashlib.sha256(str(r_recovered).encode()).digest()
+        response = hash_polynomial(r_recovered)
         return response
     
     def verify_response(self, expected_response, actual_response):
@@ -158,7 +170,7 @@ def create_quantum_challenge_circuit(n_qubits=4, noise_prob=0):
     log = []
     
     # Create qubits
-    qubits = [cirq.NamedQubit(f"q{i}") for i in range(n_qubits)]
+    qubits = cirq.LineQubit.range(n_qubits)
     circuit = cirq.Circuit()
     
     # Apply Hadamard gates to create superposition (representing key setup)
@@ -200,18 +212,23 @@ def create_quantum_challenge_circuit(n_qubits=4, noise_prob=0):
     
     return circuit, circuit_svg, log
 
-def generate_quantum_fingerprint_cirq(data, num_qubits=4):
+@lru_cache(maxsize=1024)
+def lattice_authenticate(data, num_qubits=4):
     """
-    Compatibility function for the original API.
+    Runs the Ring-LWE key generation, challenge and response for the data.
     
-    Rather than directly using quantum fingerprinting, this now uses the lattice-based
-    approach but returns results in the expected format for compatibility.
+    Everything here is deterministic in (data, num_qubits), so results are cached.
+    
+    Returns:
+        Tuple of (fingerprint, auth_success, private_key, log); the fingerprint and
+        log are tuples and the private key is a read-only array, as they are shared
     """
     log = []
     log.append("=== Post-Quantum Lattice-Based Authentication Simulation ===")
     
     # Generate deterministic seed from data
-    seed = int(hashlib.sha256(data.encode()).hexdigest(), 16) % (2**32)
+    # (the low 32 bits of the digest, i.e. its last four bytes)
+    seed = int.from_bytes(hashlib.sha256(data.encode()).digest()[-4:], 'big')
     log.append(f"Authenticating data: {data}")
     log.append(f"Using seed: {seed}")
     
@@ -248,23 +265,37 @@ def generate_quantum_fingerprint_cirq(data, num_qubits=4):
     else:
         log.append("✗ Authentication failed!")
     
-    # Create visualization circuits
-    circuit, circuit_svg, viz_log = create_quantum_challenge_circuit(num_qubits)
-    log.extend(viz_log)
-    
-    # Create a "fingerprint" representation from the private key for compatibility
-    # This is just a visualization representation, not the actual authentication token
-    fingerprint = [int(x % 2) for x in private_key[:num_qubits]]
+    # Set fingerprint to a deterministic value for the API (not actually used in auth):
+    # the low bit of the first hex digit, i.e. bit 4 of the first digest byte
+    fingerprint = tuple((hashlib.sha256((data + str(i)).encode()).digest()[0] >> 4) & 1
+                        for i in range(num_qubits))
     
-    # Generate additional visualizations
-    key_viz_base64 = generate_lattice_visualization(private_key, num_qubits)
+    private_key.setflags(write=False)
+    return fingerprint, bool(auth_success), private_key, tuple(log)
+
+def generate_quantum_fingerprint_cirq(data, num_qubits=4, render_viz=True):
+    """
+    Compatibility function for the original API.
     
-    # Set fingerprint to a deterministic value for the API (not actually used in auth)
-    fingerprint = [int(hashlib.sha256((data + str(i)).encode()).hexdigest()[0], 16) % 2 
-                   for i in range(num_qubits)]
+    Rather than directly using quantum fingerprinting, this now uses the lattice-based
+    approach but returns results in the expected format for compatibility.
+    With render_viz=False the circuit SVG and lattice plot are skipped and returned as None.
+    """
+    fingerprint, auth_success, private_key, auth_log = lattice_authenticate(data, num_qubits)
+    log = list(auth_log)
+    circuit_svg = None
+    key_viz_base64 = None
+    
+    if render_viz:
+        # Create visualization circuits
+        circuit, circuit_svg, viz_log = create_quantum_challenge_circuit(num_qubits)
+        log.extend(viz_log)
+        
+        # Generate additional visualizations
+        key_viz_base64 = generate_lattice_visualization(private_key, num_qubits)
     
     return {
-        'fingerprint': fingerprint,
+        'fingerprint': list(fingerprint),
         'circuit_svg': circuit_svg, 
         'lattice_viz': key_viz_base64,
         'auth_success': auth_success,
@@ -276,43 +307,46 @@ def verify_fingerprint_cirq(data, fingerprint, num_qubits=4):
     Compatibility function for the original API.
     Verifies if a given fingerprint matches the one generated from data.
     """
-    result = generate_quantum_fingerprint_cirq(data, num_qubits)
-    return result['fingerprint'] == fingerprint
+    # Only the authentication core is needed; skip the visualizations
+    return list(lattice_authenticate(data, num_qubits)[0]) == fingerprint
 
 def generate_lattice_visualization(coefficients, num_qubits):
     """Generate visualization of lattice points for quantum visualization."""
-    plt.figure(figsize=(8, 6))
+    # Imported here so authentication alone never loads matplotlib. The Figure API
+    # keeps no global pyplot state, so concurrent simulation threads cannot collide.
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    
+    fig = Figure(figsize=(8, 6))
+    canvas = FigureCanvasAgg(fig)
+    scatter_ax, hist_ax = fig.subplots(2, 1)
     
     # Create a subset of the coefficients for plotting
     n_coeffs = min(len(coefficients), 100)
     subset = coefficients[:n_coeffs]
     
     # Create a scatter plot for the lattice points
-    plt.subplot(2, 1, 1)
     x = np.arange(n_coeffs)
-    plt.scatter(x, subset, s=30, c=subset, cmap='viridis', alpha=0.7)
-    plt.title('Lattice Coefficients (First 100 Values)')
-    plt.xlabel('Index')
-    plt.ylabel('Value Modulo q')
-    plt.grid(alpha=0.3)
+    scatter_ax.scatter(x, subset, s=30, c=subset, cmap='viridis', alpha=0.7)
+    scatter_ax.set_title('Lattice Coefficients (First 100 Values)')
+    scatter_ax.set_xlabel('Index')
+    scatter_ax.set_ylabel('Value Modulo q')
+    scatter_ax.grid(alpha=0.3)
     
     # Create a histogram of coefficients
-    plt.subplot(2, 1, 2)
-    plt.hist(coefficients, bins=30, alpha=0.7, color='blue')
-    plt.title('Lattice Coefficient Distribution')
-    plt.xlabel('Coefficient Value')
-    plt.ylabel('Frequency')
-    plt.grid(alpha=0.3)
+    hist_ax.hist(coefficients, bins=30, alpha=0.7, color='blue')
+    hist_ax.set_title('Lattice Coefficient Distribution')
+    hist_ax.set_xlabel('Coefficient Value')
+    hist_ax.set_ylabel('Frequency')
+    hist_ax.grid(alpha=0.3)
     
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Convert plot to base64 encoded string
     buffer = BytesIO()
-    plt.savefig(buffer, format='png')
-    buffer.seek(0)
+    canvas.print_png(buffer)
     image_png = buffer.getvalue()
     buffer.close()
-    plt.close()
     
     return base64.b64encode(image_png).decode('utf-8')
 
@@ -9,13 +9,95 @@ import numpy as np
 import json
 import uuid
 import os
+import hashlib
+from collections import OrderedDict
 from flask import jsonify, request, abort
 from typing import Dict, List, Optional, Tuple, Any, Union
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
 # Circuit storage directory
 CIRCUIT_DIR = os.path.join(os.path.dirname(__file__), 'user_circuits')
 os.makedirs(CIRCUIT_DIR, exist_ok=True)
 
+# Summaries of every saved circuit, kept sorted by name
+CIRCUIT_INDEX = os.path.join(CIRCUIT_DIR, '_index.json')
+
+# Shared generator for sampling measurement counts
+RNG = np.random.default_rng()
+
+# Gate fusion only pays for itself on wide, deep circuits
+FUSION_MIN_QUBITS = 12
+FUSION_MIN_OPERATIONS = 20
+
+# Number of simulation results kept per designer
+SIMULATION_CACHE_SIZE = 32
+
+# Phase each Pauli applies to |0> and |1> before any bit flip (Y = X . diag(i, -i))
+PAULI_PHASES = {'X': (1, 1), 'Y': (1j, -1j), 'Z': (1, -1)}
+PAULI_LABELS = {cirq.X: 'X', cirq.Y: 'Y', cirq.Z: 'Z'}
+
+class PauliMaskGate(cirq.Gate):
+    """Tensor product of X, Y and Z gates applied in one statevector pass"""
+    
+    def __init__(self, paulis: str):
+        self.paulis = paulis
+    
+    def _num_qubits_(self) -> int:
+        return len(self.paulis)
+    
+    def _has_unitary_(self) -> bool:
+        return True
+    
+    def _apply_unitary_(self, args: 'cirq.ApplyUnitaryArgs') -> np.ndarray:
+        target = args.target_tensor
+        
+        # Broadcastable diagonal phases for all Y/Z qubits
+        phases = np.ones((1,) * target.ndim, dtype=target.dtype)
+        for axis, pauli in zip(args.axes, self.paulis):
+            if pauli != 'X':
+                shape = [1] * target.ndim
+                shape[axis] = 2
+                phases = phases * np.array(PAULI_PHASES[pauli], dtype=target.dtype).reshape(shape)
+        
+        # Flipping X/Y axes permutes amplitudes; the phases are flipped to match
+        flip_axes = tuple(axis for axis, pauli in zip(args.axes, self.paulis) if pauli != 'Z')
+        np.multiply(np.flip(target, axis=flip_axes), np.flip(phases, axis=flip_axes),
+                    out=args.available_buffer)
+        return args.available_buffer
+    
+    def _circuit_diagram_info_(self, args) -> Tuple[str, ...]:
+        return tuple(self.paulis)
+
+def fuse_pauli_masks(circuit: cirq.Circuit) -> cirq.Circuit:
+    """Group consecutive Pauli gates on distinct qubits into single PauliMaskGates"""
+    fused_ops = []
+    group = []
+    
+    def flush():
+        if len(group) > 1:
+            paulis = ''.join(PAULI_LABELS[op.gate] for op in group)
+            fused_ops.append(PauliMaskGate(paulis).on(*(op.qubits[0] for op in group)))
+        else:
+            fused_ops.extend(group)
+        group.clear()
+    
+    for op in circuit.all_operations():
+        if op.gate in PAULI_LABELS:
+            # Consecutive operations on disjoint qubits commute, so they can share a mask
+            if any(op.qubits[0] == other.qubits[0] for other in group):
+                flush()
+            group.append(op)
+        else:
+            flush()
+            fused_ops.append(op)
+    flush()
+    
+    return cirq.Circuit(fused_ops)
+
 class QuantumCircuitDesigner:
 
     """Handles creation and simulation of custom quantum circuits"""
@@ -41,14 +123,31 @@ class QuantumCircuitDesigner:
         'TOFFOLI': {'name': 'Toffoli', 'cirq_gate_id': 'cirq.TOFFOLI', 'num_qubits': 3}
     }
     
+    # Cirq gate for each fixed gate type, and gate factory for each parameterized one
+    _GATE_FACTORIES = {
+        'H': cirq.H, 'X': cirq.X, 'Y': cirq.Y, 'Z': cirq.Z, 'S': cirq.S, 'T': cirq.T,
+        'CNOT': cirq.CNOT, 'CZ': cirq.CZ, 'SWAP': cirq.SWAP,
+        'CSWAP': cirq.CSWAP, 'TOFFOLI': cirq.TOFFOLI
+    }
+    _PARAM_FACTORIES = {'Rx': cirq.rx, 'Ry': cirq.ry, 'Rz': cirq.rz}
+    
     def __init__(self):
         """Initialize the circuit designer"""
+        # Simulation results keyed by (circuit hash, shots, return_statevector)
+        self._sim_cache = OrderedDict()
+        # Last rendered (circuit hash, SVG) pair
+        self._svg_cache = (None, None)
         self.reset_circuit()
     
     def reset_circuit(self) -> None:
         """Reset the current circuit"""
-        self.qubits = []
+        self.qubits = ()
         self.circuit = cirq.Circuit()
+        # Same circuit without measurements, used for the statevector pass
+        self._no_measure_circuit = cirq.Circuit()
+        # Operations in the same order as circuit_data['gates']
+        self._ops = []
+        self._circuit_hash = None
         self.circuit_data = {
             'id': str(uuid.uuid4()),
             'name': 'New Circuit',
@@ -63,7 +162,7 @@ class QuantumCircuitDesigner:
             raise ValueError("Number of qubits must be between 1 and 20")
         
         self.reset_circuit()
-        self.qubits = [cirq.NamedQubit(f'q{i}') for i in range(num_qubits)]
+        self.qubits = tuple(cirq.NamedQubit(f'q{i}') for i in range(num_qubits))
         self.circuit_data = {
             'id': str(uuid.uuid4()),
             'name': name,
@@ -74,60 +173,38 @@ class QuantumCircuitDesigner:
         
         return self.circuit_data
     
-    def add_gate(self, gate_type: str, targets: List[int], params: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
-        """
-        Add a gate to the circuit
-        
-        Args:
-            gate_type: Type of gate (e.g., 'H', 'CNOT')
-            targets: List of target qubit indices
-            params: Optional parameters for parametrized gates
-            
-        Returns:
-            Updated circuit data
-        """
-        if not self.qubits:
-            raise ValueError("No circuit initialized. Call create_empty_circuit first.")
-        
-        # Ensure targets are integers
-        targets = [int(t) for t in targets]
-        
+    def _make_operation(self, gate_type: str, targets: List[int], params: Optional[Dict[str, float]] = None) -> cirq.Operation:
+        """Build the Cirq operation for a gate entry whose targets were already validated"""
+        qubits = self.qubits
+        target_qubits = [qubits[i] for i in targets]
+        
+        if gate_type in self._PARAM_FACTORIES:
+            angle = params.get('angle', 0) if params else 0
+            return self._PARAM_FACTORIES[gate_type](rads=angle)(*target_qubits)
+        if gate_type == 'MEASURE':
+            return cirq.measure(target_qubits[0], key=f'q{targets[0]}')
+        return self._GATE_FACTORIES[gate_type](*target_qubits)
+    
+    def _validate_gate(self, gate_type: str, targets: List[int], params: Optional[Dict[str, float]]) -> Optional[Dict[str, float]]:
+        """Check a gate entry's type, target count and parameters, returning the parameters with a float angle"""
         # Handle single-qubit gates
         if gate_type in self.SINGLE_QUBIT_GATES:
             if len(targets) != 1:
                 raise ValueError(f"{gate_type} gate requires exactly 1 target qubit")
             
             gate_info = self.SINGLE_QUBIT_GATES[gate_type]
-            target_qubit = self.qubits[targets[0]]
             
             # Handle parameterized gates
             if 'params' in gate_info:
                 if not params:
                     raise ValueError(f"{gate_type} gate requires parameters: {gate_info['params']}")
                 
-                # Create the appropriate parameterized gate
-                if gate_type == 'Rx':
-                    gate = cirq.rx(rads=params.get('angle', 0))
-                elif gate_type == 'Ry':
-                    gate = cirq.ry(rads=params.get('angle', 0))
-                elif gate_type == 'Rz':
-                    gate = cirq.rz(rads=params.get('angle', 0))
-                
-                self.circuit.append(gate(target_qubit))
-            else:
-                # Simple gate with no parameters - use appropriate Cirq gate based on type
-                if gate_type == 'H':
-                    self.circuit.append(cirq.H(target_qubit))
-                elif gate_type == 'X':
-                    self.circuit.append(cirq.X(target_qubit))
-                elif gate_type == 'Y':
-                    self.circuit.append(cirq.Y(target_qubit))
-                elif gate_type == 'Z':
-                    self.circuit.append(cirq.Z(target_qubit))
-                elif gate_type == 'S':
-                    self.circuit.append(cirq.S(target_qubit))
-                elif gate_type == 'T':
-                    self.circuit.append(cirq.T(target_qubit))
+                # Convert the angle once so rebuilds hand Cirq a plain float
+                try:
+                    angle = float(params.get('angle', 0.0))
+                except (TypeError, ValueError):
+                    raise ValueError(f"{gate_type} angle must be a number")
+                return dict(params, angle=angle)
         
         # Handle multi-qubit gates
         elif gate_type in self.MULTI_QUBIT_GATES:
@@ -136,33 +213,45 @@ class QuantumCircuitDesigner:
             
             if len(targets) != required_qubits:
                 raise ValueError(f"{gate_type} gate requires exactly {required_qubits} target qubits")
-            
-            # Get target qubits
-            target_qubits = [self.qubits[i] for i in targets]
-            
-            # Apply the appropriate gate based on type
-            if gate_type == 'CNOT':
-                self.circuit.append(cirq.CNOT(*target_qubits))
-            elif gate_type == 'CZ':
-                self.circuit.append(cirq.CZ(*target_qubits))
-            elif gate_type == 'SWAP':
-                self.circuit.append(cirq.SWAP(*target_qubits))
-            elif gate_type == 'CSWAP':
-                self.circuit.append(cirq.CSWAP(*target_qubits))
-            elif gate_type == 'TOFFOLI':
-                self.circuit.append(cirq.TOFFOLI(*target_qubits))
         
         # Handle measurement
         elif gate_type == 'MEASURE':
             if len(targets) != 1:
                 raise ValueError("MEASURE requires exactly 1 target qubit")
             
-            target_qubit = self.qubits[targets[0]]
-            self.circuit.append(cirq.measure(target_qubit, key=f'q{targets[0]}'))
-            
         else:
             raise ValueError(f"Unknown gate type: {gate_type}")
         
+        return params
+    
+    def add_gate(self, gate_type: str, targets: List[int], params: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """
+        Add a gate to the circuit
+        
+        Args:
+            gate_type: Type of gate (e.g., 'H', 'CNOT')
+            targets: List of target qubit indices
+            params: Optional parameters for parametrized gates
+            
+        Returns:
+            Updated circuit data
+        """
+        if not self.qubits:
+            raise ValueError("No circuit initialized. Call create_empty_circuit first.")
+        
+        # Ensure targets are integers
+        targets = [int(t) for t in targets]
+        
+        params = self._validate_gate(gate_type, targets, params)
+        
+        # Apply the gate through the dispatch tables
+        operation = self._make_operation(gate_type, targets, params)
+        self._ops.append(operation)
+        self.circuit.append(operation)
+        if gate_type != 'MEASURE':
+            self._no_measure_circuit.append(operation)
+        self._circuit_hash = None
+        
         # Update circuit data (same as before)
         gate_data = {
             'type': gate_type,
@@ -192,121 +281,142 @@ class QuantumCircuitDesigner:
         if gate_index < 0 or gate_index >= len(self.circuit_data['gates']):
             raise ValueError(f"Gate index out of range: {gate_index}")
         
-        # Remove the gate from circuit data
+        # Remove the gate from circuit data and its operation
         self.circuit_data['gates'].pop(gate_index)
+        self._ops.pop(gate_index)
+        self._circuit_hash = None
         
-        # Rebuild the circuit from scratch
-        self.circuit = cirq.Circuit()
-        for gate_data in self.circuit_data['gates']:
-            gate_type = gate_data['type']
-            targets = gate_data['targets']
-            params = gate_data.get('params')
-            
-            # Reapply gates (simplified - would need to match logic in add_gate)
-            if gate_type in self.SINGLE_QUBIT_GATES:
-                gate_info = self.SINGLE_QUBIT_GATES[gate_type]
-                target_qubit = self.qubits[targets[0]]
-                
-                if 'params' in gate_info:
-                    # Parameterized gates
-                    angle = params.get('angle', 0) if params else 0
-                    if gate_type == 'Rx':
-                        gate = cirq.rx(rads=angle)
-                    elif gate_type == 'Ry':
-                        gate = cirq.ry(rads=angle)
-                    elif gate_type == 'Rz':
-                        gate = cirq.rz(rads=angle)
-                    self.circuit.append(gate(target_qubit))
-                else:
-                    # Simple gates
-                    self.circuit.append(gate_info['cirq_gate'](target_qubit))
-            
-            elif gate_type in self.MULTI_QUBIT_GATES:
-                gate_info = self.MULTI_QUBIT_GATES[gate_type]
-                target_qubits = [self.qubits[i] for i in targets]
-                self.circuit.append(gate_info['cirq_gate'](*target_qubits))
-            
-            elif gate_type == 'MEASURE':
-                target_qubit = self.qubits[targets[0]]
-                self.circuit.append(cirq.measure(target_qubit, key=f'q{targets[0]}'))
+        # Rebuild the circuit from the cached operations
+        self.circuit = cirq.Circuit(self._ops)
+        self._no_measure_circuit = cirq.Circuit(
+            op for op in self._ops if not cirq.is_measurement(op)
+        )
         
         # Update circuit depth
         self.circuit_data['depth'] = len(self.circuit_data['gates'])
         
         return self.circuit_data
     
-    def simulate_circuit(self, shots: int = 1024) -> Dict[str, Any]:
+    def circuit_hash(self) -> str:
+        """Content hash of the current qubit count and gate list"""
+        if self._circuit_hash is None:
+            canonical = json.dumps({
+                'num_qubits': len(self.qubits),
+                'gates': self.circuit_data['gates']
+            }, sort_keys=True)
+            self._circuit_hash = hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+        return self._circuit_hash
+    
+    @staticmethod
+    def _count_bitstrings(bits: np.ndarray) -> Dict[str, int]:
+        """Histogram a (shots, width) array of measured bits into bitstring counts"""
+        width = bits.shape[1]
+        codes = bits.astype(np.int64) @ (1 << np.arange(width - 1, -1, -1, dtype=np.int64))
+        values, value_counts = np.unique(codes, return_counts=True)
+        return {format(value, f'0{width}b'): count
+                for value, count in zip(values.tolist(), value_counts.tolist())}
+    
+    @staticmethod
+    def _merge_rewriter(circuit_op: cirq.CircuitOperation) -> cirq.Operation:
+        """Collapse a merged run of single-qubit gates, leaving lone gates untouched"""
+        ops = list(circuit_op.circuit.all_operations())
+        if len(ops) == 1:
+            return ops[0]
+        # MatrixGate keeps the exact unitary, including global phase, so the
+        # reported amplitudes are unchanged
+        return cirq.MatrixGate(cirq.unitary(circuit_op)).on(*circuit_op.qubits)
+    
+    def _fused(self, circuit: cirq.Circuit) -> cirq.Circuit:
+        """Merge single-qubit gate runs and Pauli layers before simulating large circuits"""
+        if len(self.qubits) < FUSION_MIN_QUBITS or len(self._ops) <= FUSION_MIN_OPERATIONS:
+            return circuit
+        
+        merged = cirq.merge_k_qubit_unitaries(circuit, k=1, rewriter=self._merge_rewriter)
+        return fuse_pauli_masks(merged)
+    
+    def simulate_circuit(self, shots: int = 1024, return_statevector: bool = True) -> Dict[str, Any]:
         """
         Simulate the current circuit
         
         Args:
             shots: Number of measurement shots for statistics
+            return_statevector: Include the final statevector in the results
             
         Returns:
             Simulation results including statevector and measurements
         """
-        if not self.circuit.has_measurements():
-            # If there are no measurements, add them to all qubits for statistics
-            measure_circuit = cirq.Circuit()
-            for i, qubit in enumerate(self.qubits):
-                measure_circuit.append(cirq.measure(qubit, key=f'q{i}'))
-            
-            sim_circuit = self.circuit + measure_circuit
-        else:
-            sim_circuit = self.circuit
-        
-        # Run simulation without measurements to get statevector
+        cache_key = (self.circuit_hash(), shots, return_statevector)
+        cached = self._sim_cache.get(cache_key)
+        if cached is not None:
+            self._sim_cache.move_to_end(cache_key)
+            return dict(cached, circuit_data=self.circuit_data)
+        
+        has_measurements = self.circuit.has_measurements()
+        num_qubits = len(self.qubits)
         simulator = cirq.Simulator()
         
         try:
-            # First, get the statevector
-            no_measure_circuit = cirq.Circuit()
-            for op in self.circuit.all_operations():
-                if not isinstance(op.gate, cirq.MeasurementGate):
-                    no_measure_circuit.append(op)
-            
-            result = simulator.simulate(no_measure_circuit)
-            statevector = result.final_state_vector
-            
-            # Calculate probabilities
-            num_qubits = len(self.qubits)
-            probabilities = np.abs(statevector)**2
+            results = {'success': True}
+            counts = None
             
-            # Format statevector data
-            state_data = []
-            for i, amplitude in enumerate(statevector):
-                if abs(probabilities[i]) > 1e-10:  # Threshold for numerical precision
-                    state_data.append({
-                        'state': format(i, f'0{num_qubits}b'),
-                        'amplitude': {
-                            'real': float(amplitude.real),
-                            'imag': float(amplitude.imag)
-                        },
-                        'probability': float(probabilities[i])
-                    })
+            if return_statevector:
+                # Run simulation without measurements to get statevector
+                result = simulator.simulate(self._fused(self._no_measure_circuit), qubit_order=self.qubits)
+                statevector = result.final_state_vector
+                
+                # Calculate probabilities
+                probabilities = np.abs(statevector)**2
+                
+                # Format statevector data, visiting only the populated basis states
+                nonzero = np.flatnonzero(probabilities > 1e-10)  # Threshold for numerical precision
+                amplitudes = statevector[nonzero]
+                state_format = f'0{num_qubits}b'
+                results['statevector'] = [
+                    {
+                        'state': format(i, state_format),
+                        'amplitude': {'real': real, 'imag': imag},
+                        'probability': probability
+                    }
+                    for i, real, imag, probability in zip(
+                        nonzero.tolist(),
+                        amplitudes.real.tolist(),
+                        amplitudes.imag.tolist(),
+                        probabilities[nonzero].tolist()
+                    )
+                ]
+                
+                if not has_measurements:
+                    # Measuring every qubit at the end samples the final distribution,
+                    # so draw the counts from it instead of simulating again
+                    weights = probabilities.astype(np.float64)
+                    counts_arr = RNG.multinomial(shots, weights / weights.sum())
+                    counts = {format(i, f'0{num_qubits}b'): int(counts_arr[i])
+                              for i in np.flatnonzero(counts_arr)}
+            
+            if counts is None:
+                if has_measurements:
+                    # Mid-circuit measurements need a sampled run
+                    result = simulator.run(self._fused(self.circuit), repetitions=shots)
+                    measurement_keys = sorted(result.measurements.keys())
+                    bits = np.stack([result.measurements[key][:, 0] for key in measurement_keys], axis=1)
+                else:
+                    # Measure every qubit in index order for statistics
+                    measured = self.circuit + cirq.measure(*self.qubits, key='all')
+                    result = simulator.run(self._fused(measured), repetitions=shots)
+                    bits = result.measurements['all']
+                
+                counts = self._count_bitstrings(bits)
             
-            # Now run with measurements to get statistics
-            sampler = cirq.Simulator()
-            result = sampler.run(sim_circuit, repetitions=shots)
+            results['measurements'] = {
+                'counts': counts,
+                'totalShots': shots
+            }
             
-            # Process measurement results
-            measurement_keys = sorted(result.measurements.keys())
+            self._sim_cache[cache_key] = results
+            if len(self._sim_cache) > SIMULATION_CACHE_SIZE:
+                self._sim_cache.popitem(last=False)
             
-            # Convert to bitstring representation
-            counts = {}
-            for i in range(shots):
-                bitstring = ''.join([str(int(result.measurements[key][i][0])) for key in measurement_keys])
-                counts[bitstring] = counts.get(bitstring, 0) + 1
-            
-            return {
-                'success': True,
-                'statevector': state_data,
-                'measurements': {
-                    'counts': counts,
-                    'totalShots': shots
-                },
-                'circuit_data': self.circuit_data
-            }
+            return dict(results, circuit_data=self.circuit_data)
             
         except Exception as e:
             return {
@@ -316,9 +426,15 @@ class QuantumCircuitDesigner:
     
     def generate_circuit_svg(self) -> str:
         """Generate SVG visualization of the circuit"""
+        circuit_hash = self.circuit_hash()
+        if self._svg_cache[0] == circuit_hash:
+            return self._svg_cache[1]
+        
         try:
             from cirq.contrib.svg import circuit_to_svg
-            return circuit_to_svg(self.circuit)
+            svg = circuit_to_svg(self.circuit)
+            self._svg_cache = (circuit_hash, svg)
+            return svg
         except Exception as e:
             return f"<svg><text>Error generating circuit visualization: {str(e)}</text></svg>"
     
@@ -383,8 +499,14 @@ class QuantumCircuitDesigner:
         circuit_id = self.circuit_data['id']
         filepath = os.path.join(CIRCUIT_DIR, f"{circuit_id}.json")
         
-        with open(filepath, 'w') as f:
-            json.dump(self.circuit_data, f, indent=2)
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(self.circuit_data))
+        else:
+            with open(filepath, 'w') as f:
+                json.dump(self.circuit_data, f)
+        
+        self._update_index(self.circuit_data)
         
         return circuit_id
     
@@ -395,47 +517,100 @@ class QuantumCircuitDesigner:
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"Circuit with ID {circuit_id} not found")
         
-        with open(filepath, 'r') as f:
-            self.circuit_data = json.load(f)
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        self.circuit_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
         
         # Recreate qubits and circuit
-        self.qubits = [cirq.NamedQubit(f'q{i}') for i in range(self.circuit_data['num_qubits'])]
-        self.circuit = cirq.Circuit()
+        self.qubits = tuple(cirq.NamedQubit(f'q{i}') for i in range(self.circuit_data['num_qubits']))
         
-        # Rebuild the circuit
+        # Rebuild the circuit in one pass over the saved gates
+        ops = []
         for gate_data in self.circuit_data['gates']:
             gate_type = gate_data['type']
-            targets = gate_data['targets']
+            targets = [int(t) for t in gate_data['targets']]
             params = gate_data.get('params')
             
-            self.add_gate(gate_type, targets, params)
+            params = self._validate_gate(gate_type, targets, params)
+            gate_data['targets'] = targets
+            if params:
+                gate_data['params'] = params
+            ops.append(self._make_operation(gate_type, targets, params))
+        
+        self._ops = ops
+        self.circuit = cirq.Circuit(ops)
+        self._no_measure_circuit = cirq.Circuit(op for op in ops if not cirq.is_measurement(op))
+        self._circuit_hash = None
+        self.circuit_data['depth'] = len(ops)
         
         return self.circuit_data
     
-    def list_saved_circuits(self) -> List[Dict[str, Any]]:
-        """List all saved circuits"""
+    @staticmethod
+    def _circuit_summary(circuit_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Minimal information listed for a saved circuit"""
+        return {
+            'id': circuit_data['id'],
+            'name': circuit_data['name'],
+            'num_qubits': circuit_data['num_qubits'],
+            'depth': circuit_data['depth']
+        }
+    
+    def _load_index(self) -> Optional[List[Dict[str, Any]]]:
+        """Read the saved-circuit index, or None if it is missing or unreadable"""
+        try:
+            with open(CIRCUIT_INDEX, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+    
+    def _write_index(self, circuits: List[Dict[str, Any]]) -> None:
+        """Atomically replace the saved-circuit index"""
+        tmp_path = f"{CIRCUIT_INDEX}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(sorted(circuits, key=lambda c: c['name']), f)
+        os.replace(tmp_path, CIRCUIT_INDEX)
+    
+    def _scan_saved_circuits(self) -> List[Dict[str, Any]]:
+        """Read the summary of every circuit file in the storage directory"""
         circuits = []
         
         for filename in os.listdir(CIRCUIT_DIR):
-            if filename.endswith('.json'):
+            if filename.endswith('.json') and filename != os.path.basename(CIRCUIT_INDEX):
                 filepath = os.path.join(CIRCUIT_DIR, filename)
                 
                 try:
                     with open(filepath, 'r') as f:
                         circuit_data = json.load(f)
                         
-                    # Include minimal information
-                    circuits.append({
-                        'id': circuit_data['id'],
-                        'name': circuit_data['name'],
-                        'num_qubits': circuit_data['num_qubits'],
-                        'depth': circuit_data['depth']
-                    })
+                    circuits.append(self._circuit_summary(circuit_data))
                 except:
                     # Skip invalid files
                     pass
         
-        return sorted(circuits, key=lambda c: c['name'])
+        return circuits
+    
+    def _update_index(self, circuit_data: Dict[str, Any]) -> None:
+        """Record a saved circuit in the index"""
+        circuits = self._load_index()
+        if circuits is None:
+            # The scan already picks up the file that was just written
+            circuits = self._scan_saved_circuits()
+        else:
+            circuits = [c for c in circuits if c['id'] != circuit_data['id']]
+            circuits.append(self._circuit_summary(circuit_data))
+        
+        self._write_index(circuits)
+    
+    def list_saved_circuits(self) -> List[Dict[str, Any]]:
+        """List all saved circuits"""
+        circuits = self._load_index()
+        if circuits is None:
+            # Rebuild a missing index from the circuit files
+            circuits = self._scan_saved_circuits()
+            self._write_index(circuits)
+            return sorted(circuits, key=lambda c: c['name'])
+        
+        return circuits
 
 # Flask routes for circuit designer API
 def register_circuit_designer_routes(app):
@@ -501,8 +676,12 @@ def register_circuit_designer_routes(app):
         
         try:
             shots = int(data.get('shots', 1024))
+            return_statevector = data.get('return_statevector', True)
+            
+            if not isinstance(return_statevector, bool):
+                return jsonify({'success': False, 'error': 'return_statevector must be true or false'}), 400
             
-            result = designer.simulate_circuit(shots)
+            result = designer.simulate_circuit(shots, return_statevector)
             result['svg'] = designer.generate_circuit_svg()
             
             return jsonify(result)
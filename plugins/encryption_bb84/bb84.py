@@ -9,7 +9,6 @@ This module builds a comprehensive BB84 quantum key distribution simulation that
 - Realistic security parameter estimation
 """
 import cirq
-import random
 import numpy as np
 import math
 from cirq.contrib.svg import circuit_to_svg
@@ -19,6 +18,21 @@ SPEED_OF_LIGHT = 299792458  # m/s
 FIBER_LOSS_DB_PER_KM = 0.2  # Standard telecom fiber loss
 DETECTOR_EFFICIENCY = 0.85  # Typical superconducting detector efficiency
 
+# Basis labels indexed by basis choice (0 = computational, 1 = Hadamard)
+BASIS_LABELS = np.array(['Z', 'X'])
+
+# Random bit and basis choices are drawn in bulk from one generator
+RNG = np.random.default_rng()
+
+# Single-qubit gates for the batched density-matrix transmission model
+PAULI_X = np.array([[0, 1], [1, 0]], dtype=np.complex128)
+HADAMARD = np.array([[1, 1], [1, -1]], dtype=np.complex128) / np.sqrt(2)
+
+# Sample circuit visualization using only the first qubit; the circuit is fixed,
+# so this always gives a valid SVG without rendering per call
+_sample_q = cirq.NamedQubit('q0')
+SAMPLE_CIRCUIT_SVG = circuit_to_svg(cirq.Circuit([cirq.H(_sample_q), cirq.measure(_sample_q)]))
+
 def create_hardware_noise_model(hardware_type='fiber', distance_km=0, detector_dark_count=1e-6):
     """
     Creates a realistic hardware-specific noise model.
@@ -63,29 +77,96 @@ def create_hardware_noise_model(hardware_type='fiber', distance_km=0, detector_d
     
     return models.get(hardware_type, models['fiber'])
 
+def gate_noise_channels(noise_model):
+    """Noise channels applied after every gate, in order."""
+    # Depolarizing channel to model general noise
+    depolarizing_prob = min(0.01, noise_model['phase_drift'] + noise_model['polarization_drift'])
+    channels = [cirq.depolarize(depolarizing_prob)]
+    
+    # Amplitude damping to model photon loss during computation
+    if noise_model['photon_loss'] > 0:
+        amp_damp_prob = min(0.1, noise_model['photon_loss'] / 10)  # Scale down for gate operations
+        channels.append(cirq.amplitude_damp(amp_damp_prob))
+    
+    # Phase damping to model decoherence
+    coherence_error = min(0.05, 1e-9 / noise_model['coherence_time'])
+    channels.append(cirq.phase_damp(coherence_error))
+    return channels
+
 def add_realistic_noise(circuit, noise_model, qubit):
     """Add realistic hardware-specific noise to the circuit."""
     noisy_circuit = cirq.Circuit()
+    channels = gate_noise_channels(noise_model)
     
     # Add original operations
     for op in circuit.all_operations():
         noisy_circuit.append(op)
-        
-        # Add depolarizing channel to model general noise
-        depolarizing_prob = min(0.01, noise_model['phase_drift'] + noise_model['polarization_drift'])
-        noisy_circuit.append(cirq.depolarize(depolarizing_prob).on(qubit))
-        
-        # Add amplitude damping to model photon loss during computation
-        if noise_model['photon_loss'] > 0:
-            amp_damp_prob = min(0.1, noise_model['photon_loss'] / 10)  # Scale down for gate operations
-            noisy_circuit.append(cirq.amplitude_damp(amp_damp_prob).on(qubit))
-        
-        # Add phase damping to model decoherence
-        coherence_error = min(0.05, 1e-9 / noise_model['coherence_time'])
-        noisy_circuit.append(cirq.phase_damp(coherence_error).on(qubit))
+        noisy_circuit.append(channel.on(qubit) for channel in channels)
     
     return noisy_circuit
 
+def measure_noisy_transmission(stages, bob_bases, noise_model):
+    """
+    Evolves every transmitted qubit as a 2x2 density matrix at once and samples Bob's outcomes.
+    
+    Matches running add_realistic_noise circuits one bit at a time: the hardware noise
+    channels follow each gate, and Bob's basis change and measurement are noiseless.
+    
+    Args:
+        stages: Ordered (mask, unitary) pairs; each unitary is applied to the bits in its mask
+        bob_bases: uint8 array of Bob's bases (1 = Hadamard before measurement)
+        noise_model: Noise parameters from create_hardware_noise_model
+        
+    Returns:
+        uint8 array of Bob's measurement outcomes
+    """
+    n = len(bob_bases)
+    rho = np.zeros((n, 2, 2), dtype=np.complex128)
+    rho[:, 0, 0] = 1
+    kraus_sets = [cirq.kraus(channel) for channel in gate_noise_channels(noise_model)]
+    
+    for mask, unitary in stages:
+        if not mask.any():
+            continue
+        sub = unitary @ rho[mask] @ unitary.conj().T
+        for kraus_ops in kraus_sets:
+            sub = sum(k @ sub @ k.conj().T for k in kraus_ops)
+        rho[mask] = sub
+    
+    bob_x = bob_bases == 1
+    rho[bob_x] = HADAMARD @ rho[bob_x] @ HADAMARD
+    
+    # Probability of outcome 1 is the |1><1| population
+    return (RNG.random(n) < rho[:, 1, 1].real).astype(np.uint8)
+
+def sample_transmission(alice_bits, alice_bases, bob_bases, noise_model):
+    """
+    Samples the simplified (non-circuit) transmission model for every bit at once.
+    
+    Matching bases reproduce Alice's bit up to drift errors, mismatched bases give a
+    uniformly random bit, and a dark count replaces the outcome with a random bit.
+    
+    Args:
+        alice_bits: uint8 array of Alice's bits
+        alice_bases: uint8 array of Alice's bases (0 = Z, 1 = X)
+        bob_bases: uint8 array of Bob's bases
+        noise_model: Noise parameters from create_hardware_noise_model
+        
+    Returns:
+        Tuple of (received, dark_counts, bob_bits) arrays; bob_bits is 0 where lost
+    """
+    n = len(alice_bits)
+    received = RNG.random(n) >= noise_model['photon_loss']
+    dark_counts = received & (RNG.random(n) < noise_model['dark_count_probability'])
+    
+    error_prob = noise_model['polarization_drift'] + noise_model['phase_drift']
+    errors = (RNG.random(n) < error_prob).astype(np.uint8)
+    # Mismatched bases and dark counts both yield a random bit, so one draw serves both
+    random_bits = RNG.integers(0, 2, n, dtype=np.uint8)
+    bob_bits = np.where(dark_counts | (alice_bases != bob_bases), random_bits, alice_bits ^ errors)
+    bob_bits[~received] = 0
+    return received, dark_counts, bob_bits.astype(np.uint8)
+
 def simulate_eavesdropping(alice_bits, alice_bases, eve_strategy, detection_probability=0.5):
     """
     Simulate an eavesdropper with various attack strategies.
@@ -99,60 +180,43 @@ def simulate_eavesdropping(alice_bits, alice_bases, eve_strategy, detection_prob
     Returns:
         Dictionary with eavesdropping results and analysis
     """
-    eve_bases = [random.choice(['Z', 'X']) for _ in range(len(alice_bits))]
-    eve_measurements = []
-    modified_states = []
-    detection_events = []
+    n = len(alice_bits)
+    bits = np.asarray(alice_bits, dtype=np.uint8)
+    eve_bases_arr = BASIS_LABELS[RNG.integers(0, 2, n, dtype=np.uint8)]
+    eve_bases = eve_bases_arr.tolist()
+    same_basis = eve_bases_arr == np.asarray(alice_bases, dtype=eve_bases_arr.dtype)
     information_gain = 0
     
-    for i in range(len(alice_bits)):
-        if eve_strategy == 'intercept_resend':
-            # Eve measures in her random basis
-            if eve_bases[i] == alice_bases[i]:
-                # If Eve uses same basis as Alice, she gets correct result
-                eve_measurement = alice_bits[i]
-                detection = False  # Eve won't be detected here
-            else:
-                # If Eve uses wrong basis, she gets random result
-                eve_measurement = random.randint(0, 1)
-                detection = random.random() < detection_probability  # Eve might be detected
-            
-            # Eve resends based on her measurement and basis
-            if eve_bases[i] == alice_bases[i]:
-                # If Eve measured in correct basis, state is unchanged
-                modified_state = alice_bits[i]
-            else:
-                # If Eve measured in wrong basis, state is randomized
-                modified_state = random.randint(0, 1)
-                
-        elif eve_strategy == 'beam_splitting':
-            # Eve captures a portion of photons in a beam splitting attack
-            # She only gets information when measuring in correct basis
-            if eve_bases[i] == alice_bases[i]:
-                eve_measurement = alice_bits[i]
-                information_gain += 1
-            else:
-                eve_measurement = random.randint(0, 1)
-            
-            # Original state is preserved, harder to detect
-            modified_state = alice_bits[i]
-            detection = random.random() < (detection_probability / 3)  # Much harder to detect
-            
-        elif eve_strategy == 'trojan_horse':
-            # Eve sends additional photons to probe the system
-            eve_measurement = alice_bits[i]  # Gets perfect information
-            modified_state = alice_bits[i]  # State is preserved
-            detection = random.random() < (detection_probability * 2)  # Easier to detect
-            information_gain += 1
-            
-        else:  # No eavesdropping or unknown strategy
-            eve_measurement = None
-            modified_state = alice_bits[i]
-            detection = False
+    if eve_strategy == 'intercept_resend':
+        # Eve measures in her random basis: correct result when it matches Alice's,
+        # otherwise a random result that may reveal her
+        eve_measurements = np.where(same_basis, bits, RNG.integers(0, 2, n, dtype=np.uint8)).tolist()
+        detection_events = ~same_basis & (RNG.random(n) < detection_probability)
+        
+        # Eve resends based on her measurement; a wrong basis randomizes the state
+        modified_states = np.where(same_basis, bits, RNG.integers(0, 2, n, dtype=np.uint8)).tolist()
+        
+    elif eve_strategy == 'beam_splitting':
+        # Eve captures a portion of photons in a beam splitting attack
+        # She only gets information when measuring in correct basis
+        eve_measurements = np.where(same_basis, bits, RNG.integers(0, 2, n, dtype=np.uint8)).tolist()
+        information_gain = int(np.count_nonzero(same_basis))
+        
+        # Original state is preserved, harder to detect
+        modified_states = bits.tolist()
+        detection_events = RNG.random(n) < (detection_probability / 3)  # Much harder to detect
         
-        eve_measurements.append(eve_measurement)
-        modified_states.append(modified_state)
-        detection_events.append(detection)
+    elif eve_strategy == 'trojan_horse':
+        # Eve sends additional photons to probe the system
+        eve_measurements = bits.tolist()  # Gets perfect information
+        modified_states = bits.tolist()  # State is preserved
+        detection_events = RNG.random(n) < (detection_probability * 2)  # Easier to detect
+        information_gain = n
+        
+    else:  # No eavesdropping or unknown strategy
+        eve_measurements = [None] * n
+        modified_states = bits.tolist()
+        detection_events = np.zeros(n, dtype=bool)
     
     # Calculate information leakage
     if eve_strategy != 'none':
@@ -161,9 +225,10 @@ def simulate_eavesdropping(alice_bits, alice_bases, eve_strategy, detection_prob
         information_leak_ratio = 0
         
     # Calculate detection probability
-    if any(detection_events):
+    detections = int(np.count_nonzero(detection_events))
+    if detections:
         eve_detected = True
-        detection_probability = sum(detection_events) / len(detection_events)
+        detection_probability = detections / n
     else:
         eve_detected = False
         detection_probability = 0
@@ -242,7 +307,7 @@ def information_reconciliation(alice_key, bob_key, error_rate, reconciliation_ef
                 errors_identified += 1
     
     # Calculate remaining error rate
-    remaining_errors = sum(1 for a, b in zip(alice_key, corrected_key) if a != b)
+    remaining_errors = int(np.count_nonzero(np.asarray(alice_key) != np.asarray(corrected_key)))
     remaining_error_rate = remaining_errors / len(alice_key) if alice_key else 0
     
     return {
@@ -274,17 +339,13 @@ def privacy_amplification(reconciled_key, leaked_bits, security_parameter=0.1):
     if final_length <= 0:
         return []
     
-    # Apply universal hash function (simplified as XOR with random bit masks)
-    secure_key = []
-    for i in range(final_length):
-        # Create random bit mask (Toeplitz matrix row)
-        mask = [random.randint(0, 1) for _ in range(len(reconciled_key))]
-        
-        # XOR the key with mask
-        secure_bit = sum(k * m for k, m in zip(reconciled_key, mask)) % 2
-        secure_key.append(secure_bit)
+    # Apply universal hash function (simplified as XOR with random bit masks),
+    # one random mask row per output bit
+    key = np.asarray(reconciled_key, dtype=np.uint8)
+    masks = RNG.integers(0, 2, (final_length, len(key)), dtype=np.uint8)
     
-    return secure_key
+    # Parity of each masked key
+    return ((masks & key).sum(axis=1) % 2).tolist()
 
 def calculate_theoretical_key_rate(distance_km, hardware_type='fiber', eavesdropping=False):
     """
@@ -354,6 +415,7 @@ def bb84_protocol_cirq(num_bits=10, distance_km=0, hardware_type='fiber',
         detailed_simulation: Whether to run full quantum circuit simulation for each qubit
         perform_reconciliation: Whether to perform information reconciliation
         perform_amplification: Whether to perform privacy amplification
+        noise_prob: Extra depolarizing noise probability on each received qubit
         
     Returns:
         Dictionary with BB84 protocol results and analysis
@@ -370,144 +432,102 @@ def bb84_protocol_cirq(num_bits=10, distance_km=0, hardware_type='fiber',
     theoretical_key_rate = calculate_theoretical_key_rate(distance_km, hardware_type, eve_present)
     log.append(f"Theoretical key rate: {theoretical_key_rate:.2f} bits/second")
     
-    # Alice generates random bits and basis choices
-    alice_bits = [random.randint(0, 1) for _ in range(num_bits)]
-    alice_bases = [random.choice(['Z', 'X']) for _ in range(num_bits)]
+    # Alice generates random bits and basis choices (0 = Z, 1 = X)
+    alice_bits_arr = RNG.integers(0, 2, num_bits, dtype=np.uint8)
+    alice_bases_arr = RNG.integers(0, 2, num_bits, dtype=np.uint8)
     log.append(f"Alice generated {num_bits} random bits and basis choices")
     
     # Bob generates random basis choices
-    bob_bases = [random.choice(['Z', 'X']) for _ in range(num_bits)]
+    bob_bases_arr = RNG.integers(0, 2, num_bits, dtype=np.uint8)
     log.append(f"Bob generated {num_bits} random basis choices")
     
+    # Plain lists for the per-bit transmission and the returned results
+    alice_bits = alice_bits_arr.tolist()
+    alice_bases = BASIS_LABELS[alice_bases_arr].tolist()
+    bob_bases = BASIS_LABELS[bob_bases_arr].tolist()
+    
     # Quantum transmission simulation
     transmitted_states = []
-    bob_received_states = []
-    bob_measurements = []
     
-    # Create a sample circuit visualization using only the first qubit
-    # This ensures we always have a valid circuit for SVG generation
-    sample_circuit = cirq.Circuit()
-    sample_q = cirq.NamedQubit('q0')
+    # Representative single-qubit circuit, rendered once at import
+    circuit_svg = SAMPLE_CIRCUIT_SVG
     
-    # Add representative operations to sample circuit
-    sample_circuit.append(cirq.H(sample_q))
-    sample_circuit.append(cirq.measure(sample_q))
+    eve_intercepted = np.zeros(num_bits, dtype=bool)
+    if not detailed_simulation:
+        # Simplified measurement model without full circuit simulation, sampled for all bits at once
+        received, dark_counts, bob_bits_arr = sample_transmission(
+            alice_bits_arr, alice_bases_arr, bob_bases_arr, noise_model)
+    else:
+        # Noisy single-qubit evolution of every bit at once
+        received = RNG.random(num_bits) >= noise_model['photon_loss']
+        
+        # Eve interacts with the first few received bits; intercept-resend re-prepares them
+        if eve_present:
+            eve_intercepted[:5] = received[:5]
+        eve_resend = eve_intercepted if eve_strategy == 'intercept_resend' else np.zeros(num_bits, dtype=bool)
+        eve_bases_arr = RNG.integers(0, 2, num_bits, dtype=np.uint8)
+        eve_results = RNG.integers(0, 2, num_bits, dtype=np.uint8)  # Simplified, as Eve's circuit is not run
+        
+        stages = [
+            (alice_bits_arr == 1, PAULI_X),
+            (alice_bases_arr == 1, HADAMARD),
+            (eve_resend & (eve_results == 1), PAULI_X),
+            (eve_resend & (eve_bases_arr == 1), HADAMARD),
+        ]
+        measured = measure_noisy_transmission(stages, bob_bases_arr, noise_model)
+        
+        # Detector dark counts replace the outcome with a random bit
+        dark_counts = received & (RNG.random(num_bits) < noise_model['dark_count_probability'])
+        bob_bits_arr = np.where(dark_counts, RNG.integers(0, 2, num_bits, dtype=np.uint8), measured)
+        bob_bits_arr[~received] = 0
+    
+    if noise_prob > 0:
+        # A depolarized qubit measures randomly, i.e. flips with probability noise_prob / 2
+        flips = received & (RNG.random(num_bits) < noise_prob / 2)
+        bob_bits_arr = bob_bits_arr ^ flips.astype(np.uint8)
     
-    circuit_svg = circuit_to_svg(sample_circuit)
+    bob_received_states = [True if r else None for r in received.tolist()]
+    bob_measurements = [b if r else None for b, r in zip(bob_bits_arr.tolist(), received.tolist())]
     
-    # Process each bit for quantum transmission
     for i in range(num_bits):
         log.append(f"\n-- Bit {i} --")
-        q = cirq.NamedQubit(f'q{i}')
-        circuit = cirq.Circuit()
-        
-        # State preparation by Alice
-        if alice_bits[i] == 1:
-            circuit.append(cirq.X(q))
-            log.append(f"Alice prepares |1⟩ state for bit {i}")
-        else:
-            log.append(f"Alice prepares |0⟩ state for bit {i}")
-            
-        # Basis selection by Alice
+        log.append(f"Alice prepares |{alice_bits[i]}⟩ state for bit {i}")
         if alice_bases[i] == 'X':
-            circuit.append(cirq.H(q))
             log.append(f"Alice uses X basis (Hadamard applied)")
         else:
             log.append(f"Alice uses Z basis (computational basis)")
-        
-        # Simulate photon loss based on distance
-        photon_lost = random.random() < noise_model['photon_loss']
-        if photon_lost:
+        if not received[i]:
             log.append(f"Photon lost in transmission (probability: {noise_model['photon_loss']:.4f})")
-            bob_received_states.append(None)
-            bob_measurements.append(None)
             continue
-        
-        # Eve's interaction if present
-        if eve_present:
-            if i == 0:  # Log once for clarity
-                log.append(f"Eve is present using '{eve_strategy}' strategy")
-                
-            # Create Eve's circuit for interception (detailed simulation only for first few bits)
-            if i < 5 and detailed_simulation:
-                eve_q = cirq.NamedQubit(f'eve_q{i}')
-                eve_circuit = cirq.Circuit()
-                
-                # Eve measures in her chosen basis
-                if eve_strategy == 'intercept_resend':
-                    eve_basis = random.choice(['Z', 'X'])
-                    if eve_basis == 'X':
-                        eve_circuit.append(cirq.H(eve_q))
-                    eve_circuit.append(cirq.measure(eve_q, key='eve_meas'))
-                    
-                    # Prepare state to send to Bob based on Eve's measurement
-                    eve_result = random.randint(0, 1)  # Simplified for non-executed circuit
-                    if eve_result == 1:
-                        circuit.append(cirq.X(q))
-                    if eve_basis == 'X':
-                        circuit.append(cirq.H(q))
-                        
-                log.append(f"Eve intercepted bit {i} using {eve_strategy}")
-        
-        # Add realistic hardware noise
-        if detailed_simulation:
-            circuit = add_realistic_noise(circuit, noise_model, q)
-            
-        # Bob's basis selection and measurement
+        if eve_present and i == 0:
+            log.append(f"Eve is present using '{eve_strategy}' strategy")
+        if eve_intercepted[i]:
+            log.append(f"Eve intercepted bit {i} using {eve_strategy}")
         if bob_bases[i] == 'X':
-            circuit.append(cirq.H(q))
             log.append(f"Bob uses X basis (Hadamard applied)")
         else:
             log.append(f"Bob uses Z basis (computational basis)")
-            
-        # Detector dark count simulation
-        dark_count_occurred = random.random() < noise_model['dark_count_probability']
-        if dark_count_occurred:
-            bob_measurement = random.randint(0, 1)
-            log.append(f"Detector dark count occurred, random measurement: {bob_measurement}")
+        if dark_counts[i]:
+            log.append(f"Detector dark count occurred, random measurement: {bob_measurements[i]}")
         else:
-            # Measurement simulation
-            if detailed_simulation:
-                circuit.append(cirq.measure(q, key='meas'))
-                simulator = cirq.Simulator()
-                result = simulator.run(circuit, repetitions=1)
-                bob_measurement = int(result.measurements['meas'][0][0])
-            else:
-                # Simplified measurement model without full circuit simulation
-                correct_basis = alice_bases[i] == bob_bases[i]
-                
-                if correct_basis:
-                    # With probability (1-error_rate), Bob gets correct result
-                    error_prob = noise_model['polarization_drift'] + noise_model['phase_drift']
-                    if random.random() < error_prob:
-                        bob_measurement = 1 - alice_bits[i]  # Error in measurement
-                    else:
-                        bob_measurement = alice_bits[i]      # Correct measurement
-                else:
-                    # Different bases, random outcome
-                    bob_measurement = random.randint(0, 1)
-                    
-            log.append(f"Bob's measurement: {bob_measurement}")
-        
-        bob_measurements.append(bob_measurement)
-        bob_received_states.append(True)  # Successfully received
+            log.append(f"Bob's measurement: {bob_measurements[i]}")
             
     # Sift key - keep only bits where both used same basis and photon wasn't lost
-    matching_bases = [i for i in range(num_bits) if 
-                     bob_received_states[i] is not None and
-                     alice_bases[i] == bob_bases[i]]
+    sift_mask = received & (alice_bases_arr == bob_bases_arr)
+    matching_bases = np.flatnonzero(sift_mask).tolist()
     
-    shared_key = [alice_bits[i] for i in matching_bases]
-    bob_key = [bob_measurements[i] for i in matching_bases]
+    shared_key = alice_bits_arr[sift_mask].tolist()
+    bob_key = bob_bits_arr[sift_mask].tolist()
     
     # Calculate QBER (Quantum Bit Error Rate)
-    errors = sum(a != b for a, b in zip(shared_key, bob_key))
+    errors = int(np.count_nonzero(alice_bits_arr[sift_mask] != bob_bits_arr[sift_mask]))
     qber = errors / len(shared_key) if shared_key else 0
+    received_count = int(np.count_nonzero(received))
     
     log.append(f"\nMatching bases indices: {matching_bases}")
     log.append(f"Raw key length: {num_bits}")
     log.append(f"Sifted key length: {len(shared_key)}")
-    log.append(f"Transmission efficiency: {len(bob_received_states) - bob_received_states.count(None)}/{num_bits}")
+    log.append(f"Transmission efficiency: {received_count}/{num_bits}")
     log.append(f"Sifted key efficiency: {len(shared_key)}/{num_bits}")
     log.append(f"Alice's sifted key: {shared_key}")
     log.append(f"Bob's measured key: {bob_key}")
@@ -577,7 +597,7 @@ def bb84_protocol_cirq(num_bits=10, distance_km=0, hardware_type='fiber',
         'error_rate': qber,
         'eve_detected_by_qber': eve_detected_by_qber,
         'photon_loss_rate': noise_model['photon_loss'],
-        'transmission_efficiency': (len(bob_received_states) - bob_received_states.count(None))/num_bits,
+        'transmission_efficiency': received_count/num_bits,
         'sifted_key_ratio': len(shared_key)/num_bits if num_bits > 0 else 0,
         'final_key_ratio': len(final_key)/num_bits if final_key and num_bits > 0 else 0,
         'secure_key_rate': secure_key_rate,
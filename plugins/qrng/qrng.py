@@ -17,11 +17,20 @@ import numpy as np
 import time
 import math
 import random
+import threading
 from collections import deque, Counter
 from cirq.contrib.svg import circuit_to_svg
 from scipy import stats
 from typing import Dict, List, Tuple, Optional, Any
 
+# Number of measurement shots drawn per simulator invocation when refilling a bit pool
+POOL_BATCH_SIZE = 1024
+
+# Pre-sampled noiseless bits keyed by source name; noisy draws are not pooled,
+# since the noise level is an arbitrary client-supplied float
+_BIT_POOLS: Dict[str, deque] = {}
+_BIT_POOLS_LOCK = threading.Lock()
+
 def generate_random_bit_cirq(qubit_idx=0):
     """
     Generates a single random bit using quantum superposition.
@@ -62,9 +71,26 @@ class QuantumRandomnessSource:
         self.name = name
         self.description = description
     
+    def build_circuit(self, noise_level: float = 0.0) -> Tuple[cirq.Circuit, str]:
+        """Build the circuit for this source and return it with its output measurement key."""
+        raise NotImplementedError
+    
     def generate_bit(self, noise_level: float = 0.0) -> Tuple[int, cirq.Circuit, str]:
         """Generate a single random bit using this quantum source."""
-        raise NotImplementedError
+        circuit, key = self.build_circuit(noise_level)
+        
+        simulator = cirq.Simulator()
+        result = simulator.run(circuit, repetitions=1)
+        bit = int(result.measurements[key][0][0])
+        
+        circuit_svg = circuit_to_svg(circuit)
+        return bit, circuit, circuit_svg
+    
+    def sample_bits(self, repetitions: int, noise_level: float = 0.0) -> List[int]:
+        """Sample many bits from a single simulator run of this source's circuit."""
+        circuit, key = self.build_circuit(noise_level)
+        result = cirq.Simulator().run(circuit, repetitions=repetitions)
+        return result.measurements[key][:, 0].astype(int).tolist()
 
 class SuperpositionSource(QuantumRandomnessSource):
     """Quantum randomness from superposition collapse."""
@@ -75,7 +101,7 @@ class SuperpositionSource(QuantumRandomnessSource):
             "Uses Hadamard gates to create equal superposition states"
         )
     
-    def generate_bit(self, noise_level: float = 0.0) -> Tuple[int, cirq.Circuit, str]:
+    def build_circuit(self, noise_level: float = 0.0) -> Tuple[cirq.Circuit, str]:
         q = cirq.NamedQubit("q_super")
         circuit = cirq.Circuit()
         
@@ -88,14 +114,7 @@ class SuperpositionSource(QuantumRandomnessSource):
         
         # Measure
         circuit.append(cirq.measure(q, key='m'))
-        
-        # Simulate
-        simulator = cirq.Simulator()
-        result = simulator.run(circuit, repetitions=1)
-        bit = int(result.measurements['m'][0][0])
-        
-        circuit_svg = circuit_to_svg(circuit)
-        return bit, circuit, circuit_svg
+        return circuit, 'm'
 
 class VacuumFluctuationSource(QuantumRandomnessSource):
     """Simulated vacuum fluctuation randomness."""
@@ -106,7 +125,7 @@ class VacuumFluctuationSource(QuantumRandomnessSource):
             "Simulates quantum vacuum fluctuations for randomness"
         )
     
-    def generate_bit(self, noise_level: float = 0.0) -> Tuple[int, cirq.Circuit, str]:
+    def build_circuit(self, noise_level: float = 0.0) -> Tuple[cirq.Circuit, str]:
         # Simulate vacuum fluctuations using phase randomization
         q = cirq.NamedQubit("q_vacuum")
         circuit = cirq.Circuit()
@@ -121,13 +140,7 @@ class VacuumFluctuationSource(QuantumRandomnessSource):
             circuit.append(cirq.phase_flip(noise_level).on(q))
         
         circuit.append(cirq.measure(q, key='m'))
-        
-        simulator = cirq.Simulator()
-        result = simulator.run(circuit, repetitions=1)
-        bit = int(result.measurements['m'][0][0])
-        
-        circuit_svg = circuit_to_svg(circuit)
-        return bit, circuit, circuit_svg
+        return circuit, 'm'
 
 class EntanglementSource(QuantumRandomnessSource):
     """Quantum randomness from entanglement measurements."""
@@ -138,7 +151,7 @@ class EntanglementSource(QuantumRandomnessSource):
             "Uses entangled qubit measurements for randomness"
         )
     
-    def generate_bit(self, noise_level: float = 0.0) -> Tuple[int, cirq.Circuit, str]:
+    def build_circuit(self, noise_level: float = 0.0) -> Tuple[cirq.Circuit, str]:
         q1, q2 = cirq.NamedQubit("q_ent1"), cirq.NamedQubit("q_ent2")
         circuit = cirq.Circuit()
         
@@ -154,13 +167,24 @@ class EntanglementSource(QuantumRandomnessSource):
         # Measure first qubit for randomness
         circuit.append(cirq.measure(q1, key='m1'))
         circuit.append(cirq.measure(q2, key='m2'))
-        
-        simulator = cirq.Simulator()
-        result = simulator.run(circuit, repetitions=1)
-        bit = int(result.measurements['m1'][0][0])
-        
-        circuit_svg = circuit_to_svg(circuit)
-        return bit, circuit, circuit_svg
+        return circuit, 'm1'
+
+def draw_pooled_bits(source: QuantumRandomnessSource, count: int, noise_level: float = 0.0) -> List[int]:
+    """
+    Draw bits for a source from its pre-sampled pool.
+    
+    Noiseless pools are refilled with POOL_BATCH_SIZE shots from a single simulator
+    run whenever they run dry, so simulator setup is shared across many requests.
+    Noisy draws are sampled directly in one run.
+    """
+    if noise_level > 0:
+        return source.sample_bits(count, noise_level)
+    
+    with _BIT_POOLS_LOCK:
+        pool = _BIT_POOLS.setdefault(source.name, deque())
+        while len(pool) < count:
+            pool.extend(source.sample_bits(max(POOL_BATCH_SIZE, count - len(pool))))
+        return [pool.popleft() for _ in range(count)]
 
 class StatisticalAnalyzer:
     """Analyzes the statistical quality of random bit sequences."""
@@ -339,12 +363,20 @@ def generate_random_number_cirq(num_bits=8, source_type="superposition", noise_l
     log.append(f"Generation started: {time.strftime('%Y-%m-%d %H:%M:%S')}")
     log.append("")
     
-    # Generate raw bits
+    # Generate raw bits from the batched measurement pool
     raw_bits = []
     circuits = []
     bit_generation_times = []
     
-    for i in range(num_bits):
+    source_circuit, _ = source.build_circuit(noise_level)
+    source_svg = circuit_to_svg(source_circuit)
+    
+    # Draw every bit at once; each bit is charged an equal share of the draw time
+    draw_start = time.time()
+    pooled_bits = draw_pooled_bits(source, num_bits, noise_level)
+    draw_time_ms = (time.time() - draw_start) * 1000 / max(num_bits, 1)
+    
+    for i, bit in enumerate(pooled_bits):
         start_time = time.time()
         
         # Apply hardware simulation delays
@@ -352,11 +384,10 @@ def generate_random_number_cirq(num_bits=8, source_type="superposition", noise_l
             # Simulate realistic quantum hardware timing
             time.sleep(0.001)  # 1ms per bit (realistic for some quantum hardware)
         
-        bit, circuit, circuit_svg = source.generate_bit(noise_level)
         raw_bits.append(bit)
-        circuits.append(circuit_svg)
+        circuits.append(source_svg)
         
-        generation_time_ms = (time.time() - start_time) * 1000
+        generation_time_ms = (time.time() - start_time) * 1000 + draw_time_ms
         bit_generation_times.append(generation_time_ms)
         
         log.append(f"Bit {i}: Generated {bit} ({generation_time_ms:.2f}ms)")
@@ -483,7 +514,10 @@ def generate_random_number_cirq(num_bits=8, source_type="superposition", noise_l
         },
         
         "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-        "log": "\n".join(log)
+        "log": "\n".join(log),
+        
+        # Every value above is already JSON-serializable, so the app can skip json_safe
+        "__json_safe__": True
     }
 
 if __name__ == '__main__':